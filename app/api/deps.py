@@ -0,0 +1,81 @@
+"""
+Shared FastAPI dependencies
+"""
+
+from fastapi import Request, HTTPException, status, Depends
+from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.core.security import verify_token, load_auth_state
+from app.core.database import get_db
+from app.crud.user import user_crud
+from app.models.user import User, UserStatus
+
+# FastAPI security scheme
+security = HTTPBearer()
+
+
+def middleware_payload(request: Request, token: str) -> Optional[dict]:
+    """
+    Payload AuthMiddleware already verified for this token, if any.
+
+    The middleware is the single source of truth: when it has checked the
+    token against the blacklist and verified it, dependencies reuse the
+    result instead of repeating both steps.
+    """
+    if getattr(request.state, "token", None) == token:
+        return getattr(request.state, "jwt_payload", None)
+    return None
+
+
+async def get_current_user(
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: AsyncSession = Depends(get_db)
+) -> User:
+    """
+    Dependency to get current authenticated user.
+    """
+    token = credentials.credentials
+    
+    payload = middleware_payload(request, token)
+    checked_by_middleware = payload is not None
+    if payload is None:
+        # Verify token
+        payload = verify_token(token)
+        if not payload:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired token"
+            )
+    
+    user_id = payload.get("sub")
+    if not user_id:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid token payload"
+        )
+    
+    # Blacklist check and cached user in one Redis round trip
+    revoked, cached_user = await load_auth_state(payload, check_revoked=not checked_by_middleware)
+    if revoked:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked"
+        )
+    
+    # Get user from the cache, falling back to the database
+    user = await user_crud.get_cached(db, user_id=int(user_id), cached=cached_user)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    
+    if user.status != UserStatus.ACTIVE:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User account is not active"
+        )
+    
+    return user
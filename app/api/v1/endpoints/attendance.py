@@ -1,13 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Path
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Path, Response
 from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime, date
 from geopy.distance import geodesic
 
-from app.core.database import get_db
+from app.core.database import get_db, get_db_ro
 from app.core.config import settings
-from app.api.v1.endpoints.auth import get_current_user
+from app.api.deps import get_current_user
 from app.models.user import User
 from app.models.attendance import Attendance, AttendancePunch, PunchType
 from app.schemas.attendance import (
@@ -54,6 +54,7 @@ async def punch_in_out(
         punch_result = await attendance_crud.process_punch(
             db,
             employee_id=employee.id,
+            company_id=employee.company_id,
             punch_type=punch_data.punch_type,
             latitude=punch_data.latitude,
             longitude=punch_data.longitude,
@@ -82,12 +83,14 @@ async def punch_in_out(
 
 @router.get("/my-attendance", response_model=List[AttendanceResponse])
 async def get_my_attendance(
+    response: Response,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
-    page: int = Query(1, ge=1),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    page: int = Query(1, ge=1, deprecated=True),
     size: int = Query(20, ge=1, le=100),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Get current user's attendance records"""
     try:
@@ -100,15 +103,24 @@ async def get_my_attendance(
             )
         
         # Get attendance records
-        attendance_records = await attendance_crud.get_employee_attendance(
-            db,
-            employee_id=employee.id,
-            start_date=start_date,
-            end_date=end_date,
-            skip=(page - 1) * size,
-            limit=size
-        )
+        try:
+            attendance_records, next_cursor = await attendance_crud.get_employee_attendance(
+                db,
+                employee_id=employee.id,
+                start_date=start_date,
+                end_date=end_date,
+                cursor=cursor,
+                skip=(page - 1) * size,
+                limit=size
+            )
+        except (ValueError, KeyError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor"
+            )
         
+        if next_cursor:
+            response.headers["X-Next-Cursor"] = next_cursor
         return attendance_records
         
     except HTTPException:
@@ -124,7 +136,7 @@ async def get_my_attendance(
 @router.get("/today-status")
 async def get_today_status(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Get today's attendance status"""
     try:
@@ -179,7 +191,7 @@ async def get_team_attendance(
     page: int = Query(1, ge=1),
     size: int = Query(50, ge=1, le=100),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Get team attendance (for managers/HR)"""
     try:
@@ -266,7 +278,7 @@ async def get_attendance_statistics(
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Get attendance statistics"""
     try:
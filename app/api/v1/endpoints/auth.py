@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from fastapi.security import HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.core.security import verify_token
+from app.core.security import verify_token, revoke_token
 from app.core.redis import redis_manager
 from app.schemas.auth import UserLogin, UserRegister, Token, TokenRefresh
 from app.crud.user import user_crud
+from app.api.deps import get_current_user, security
 from app.models.user import User
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -13,7 +14,6 @@ import logging
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
-security = HTTPBearer()
 limiter = Limiter(key_func=get_remote_address)
 
 
@@ -211,14 +211,10 @@ async def logout(
         user_id = payload.get("sub")
         if user_id:
             # Remove refresh token from Redis
-            await redis_manager.delete_cache(f"refresh_token:{user_id}")
+            await redis_manager.delete_session(f"refresh_token:{user_id}")
             
-            # Add access token to blacklist
-            await redis_manager.set_cache(
-                f"blacklist:{credentials.credentials}",
-                True,
-                expire=3600  # 1 hour (token expiry time)
-            )
+            # Blacklist the access token's jti until the token expires
+            await revoke_token(payload)
         
         return {"message": "Logged out successfully"}
         
@@ -232,61 +228,6 @@ async def logout(
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
-    """Get current authenticated user"""
-    try:
-        # Check if token is blacklisted
-        is_blacklisted = await redis_manager.get_cache(f"blacklist:{credentials.credentials}")
-        if is_blacklisted:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Token has been revoked"
-            )
-        
-        # Verify token
-        payload = verify_token(credentials.credentials)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
-        
-        user_id = payload.get("sub")
-        if not user_id:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Could not validate credentials"
-            )
-        
-        # Get user from database
-        user = await user_crud.get(db, id=int(user_id))
-        if not user:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
-            )
-        
-        if user.status != "active":
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User account is not active"
-            )
-        
-        return user
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"User authentication error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate credentials"
-        )
-
-
 @router.get("/me")
 async def get_current_user_info(
     current_user: User = Depends(get_current_user)
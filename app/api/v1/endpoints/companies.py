@@ -1,10 +1,10 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.crud.company import company_crud
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse
-from app.middleware.auth import get_current_user
+from app.api.deps import get_current_user
 from app.models.user import User
 
 router = APIRouter()
@@ -21,7 +21,9 @@ async def create_company(
 
 @router.get("/", response_model=List[CompanyResponse])
 async def get_companies(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
     industry: Optional[str] = Query(None),
@@ -30,14 +32,21 @@ async def get_companies(
     current_user: User = Depends(get_current_user)
 ):
     """Get all companies with filtering."""
-    companies = await company_crud.get_multi_with_filters(
-        db,
-        skip=skip,
-        limit=limit,
-        search=search,
-        industry=industry,
-        size=size
-    )
+    try:
+        companies, next_cursor = await company_crud.get_multi_with_filters(
+            db,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            search=search,
+            industry=industry,
+            size=size
+        )
+    except (ValueError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return companies
 
 @router.get("/current", response_model=CompanyResponse)
@@ -2,7 +2,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
-from app.middleware.auth import get_current_user
+from app.api.deps import get_current_user
 from app.models.user import User
 
 router = APIRouter()
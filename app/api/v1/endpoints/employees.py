@@ -4,7 +4,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.database import get_db
 from app.crud.employee import employee_crud
 from app.schemas.employee import EmployeeCreate, EmployeeUpdate, EmployeeResponse
-from app.middleware.auth import get_current_user
+from app.api.deps import get_current_user
 from app.models.user import User
 
 router = APIRouter()
@@ -163,5 +163,5 @@ async def bulk_import_employees(
     for emp_data in employees_data:
         emp_data.company_id = current_user.company_id
     
-    result = await employee_crud.bulk_create(db, employees_data)
+    result = await employee_crud.bulk_create(db, objs_in=employees_data)
     return result
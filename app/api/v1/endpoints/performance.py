@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, Annotated
+from typing import List, Literal, Optional, Annotated
 from datetime import date
+from celery.result import AsyncResult
+from starlette.concurrency import run_in_threadpool
 import re
-
-from app.core.database import get_db
-from app.api.v1.endpoints.auth import get_current_user
+import uuid
+import orjson
+
+from app.celery_app import celery_app
+from app.core.cache import conditional_json_response
+from app.core.config import settings
+from app.core.database import get_db, get_db_ro
+from app.core.redis import redis_manager
+from app.api.deps import get_current_user
 from app.models.performance import PerformanceReviewType, ReviewStatus, GoalStatus
 from app.schemas.performance import (
     PerformanceCreate, PerformanceUpdate, PerformanceResponse,
     PerformanceGoalCreate, PerformanceGoalUpdate, PerformanceGoalResponse,
-    PerformanceTemplateCreate, PerformanceTemplateResponse
+    PerformanceTemplateCreate, PerformanceTemplateResponse,
+    ReminderType, ReviewReminderRequest
 )
 from app.crud.performance import (
     performance_crud, performance_goal_crud, performance_template_crud
@@ -26,12 +35,35 @@ async def create_new_performance_review(
     current_user = Depends(get_current_user)
 ):
     """Create a new performance review"""
-    return await performance_crud.create_review(db, review, current_user.id, current_user.company_id)
+    return await performance_crud.create_review(
+        db, review_data=review, created_by=current_user.id, company_id=current_user.company_id
+    )
+
+
+async def assessment_body(request: Request) -> dict:
+    """Parse a (potentially large) assessment body with orjson instead of stdlib json"""
+    try:
+        data = orjson.loads(await request.body())
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Request body must be valid JSON")
+    if not isinstance(data, dict):
+        raise HTTPException(status_code=422, detail="Request body must be a JSON object")
+    return data
+
+
+def _set_page_headers(response: Response, next_cursor: Optional[str], skip: int) -> None:
+    """Expose the keyset cursor for the next page and flag deprecated ``skip`` usage"""
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if skip:
+        response.headers["Deprecation"] = "true"
 
 
 @router.get("/reviews", response_model=List[PerformanceResponse])
 async def list_performance_reviews(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=1000),
     employee_id: Optional[int] = Query(None),
     reviewer_id: Optional[int] = Query(None),
@@ -39,24 +71,40 @@ async def list_performance_reviews(
     status: Optional[ReviewStatus] = Query(None),
     review_period_start: Optional[date] = Query(None),
     review_period_end: Optional[date] = Query(None),
+    include_goals: bool = Query(False, description="Embed each review's goals; goals is empty otherwise"),
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get list of performance reviews"""
-    if employee_id:
-        return await performance_crud.get_reviews_by_employee(
-            db, employee_id, current_user.company_id, skip, limit
-        )
-    elif reviewer_id:
-        return await performance_crud.get_reviews_by_reviewer(
-            db, reviewer_id, current_user.company_id, skip, limit
-        )
-    else:
-        # Return all reviews for the company
-        return await performance_crud.get_company_reviews(
-            db, company_id=current_user.company_id, 
-            status=status, review_type=review_type, skip=skip, limit=limit
-        )
+    try:
+        if employee_id:
+            reviews, next_cursor = await performance_crud.get_reviews_by_employee(
+                db, employee_id=employee_id, company_id=current_user.company_id,
+                cursor=cursor, skip=skip, limit=limit, include_goals=include_goals
+            )
+        elif reviewer_id:
+            reviews, next_cursor = await performance_crud.get_reviews_by_reviewer(
+                db, reviewer_id=reviewer_id, company_id=current_user.company_id,
+                cursor=cursor, skip=skip, limit=limit, include_goals=include_goals
+            )
+        elif skip:
+            reviews, next_cursor = await performance_crud.get_company_reviews(
+                db, company_id=current_user.company_id, 
+                status=status, review_type=review_type,
+                cursor=cursor, skip=skip, limit=limit, include_goals=include_goals
+            )
+        else:
+            # Return all reviews for the company; pages are served from a short-lived cache
+            reviews, next_cursor = await performance_crud.get_company_reviews_cached(
+                db, company_id=current_user.company_id, 
+                status=status, review_type=review_type,
+                cursor=cursor, limit=limit, include_goals=include_goals
+            )
+    except (ValueError, KeyError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+    
+    _set_page_headers(response, next_cursor, skip)
+    return reviews
 
 
 @router.get("/reviews/{review_id}", response_model=PerformanceResponse)
@@ -89,7 +137,7 @@ async def update_performance_review_record(
 @router.post("/reviews/{review_id}/submit-self-assessment")
 async def submit_self_assessment(
     review_id: int,
-    self_assessment_data: dict,
+    self_assessment_data: dict = Depends(assessment_body),
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -109,7 +157,7 @@ async def submit_self_assessment(
 @router.post("/reviews/{review_id}/submit-manager-review")
 async def submit_manager_review(
     review_id: int,
-    manager_review_data: dict,
+    manager_review_data: dict = Depends(assessment_body),
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -158,24 +206,35 @@ async def create_new_performance_goal(
     current_user = Depends(get_current_user)
 ):
     """Create a new performance goal"""
-    return await performance_goal_crud.create_goal(db, goal)
+    return await performance_goal_crud.create_goal(db, goal_data=goal)
 
 
 @router.get("/goals", response_model=List[PerformanceGoalResponse])
 async def list_performance_goals(
-    skip: int = Query(0, ge=0),
+    response: Response,
+    after_id: Optional[int] = Query(None, ge=1, description="Cursor: last goal ID of the previous page"),
+    skip: int = Query(0, ge=0, deprecated=True),
     limit: int = Query(100, ge=1, le=1000),
     performance_id: Optional[int] = Query(None),
     status: Optional[GoalStatus] = Query(None),
     category: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user = Depends(get_current_user)
 ):
-    """Get list of performance goals"""
-    if performance_id:
-        return await performance_goal_crud.get_goals_by_performance(db, performance_id, status)
-    else:
+    """
+    Get list of performance goals, ``limit`` at a time (100 by default).
+
+    When more goals exist the X-Next-Cursor response header carries the
+    ``after_id`` for the next page; keep requesting until it is absent.
+    """
+    if not performance_id:
         return []
+    
+    goals, next_cursor = await performance_goal_crud.get_goals_by_performance(
+        db, performance_id=performance_id, status=status, after_id=after_id, skip=skip, limit=limit
+    )
+    _set_page_headers(response, next_cursor, skip)
+    return goals
 
 
 @router.put("/goals/{goal_id}", response_model=PerformanceGoalResponse)
@@ -186,7 +245,7 @@ async def update_performance_goal_record(
     current_user = Depends(get_current_user)
 ):
     """Update performance goal"""
-    goal = await performance_goal_crud.update_goal(db, goal_id, goal_update)
+    goal = await performance_goal_crud.update_goal(db, goal_id=goal_id, goal_update=goal_update)
     if not goal:
         raise HTTPException(status_code=404, detail="Performance goal not found")
     return goal
@@ -247,14 +306,15 @@ async def get_employee_performance_history(
     current_user = Depends(get_current_user)
 ):
     """Get performance review history for an employee"""
-    reviews = await performance_crud.get_reviews_by_employee(
-        db, employee_id=employee_id, company_id=current_user.company_id
+    reviews, _ = await performance_crud.get_reviews_by_employee(
+        db, employee_id=employee_id, company_id=current_user.company_id, include_goals=True
     )
     return reviews
 
 
 @router.get("/reviews/analytics/summary")
 async def get_performance_analytics(
+    request: Request,
     start_date: Optional[date] = Query(None),
     end_date: Optional[date] = Query(None),
     department_id: Optional[int] = Query(None),
@@ -269,12 +329,13 @@ async def get_performance_analytics(
         end_date=end_date,
         department_id=department_id
     )
-    return analytics
+    return conditional_json_response(request, analytics)
 
 
 @router.post("/reviews/bulk-create")
 async def bulk_create_reviews(
     review_data: dict,
+    return_mode: Literal["count", "full"] = Query("count", alias="return"),
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
@@ -283,23 +344,52 @@ async def bulk_create_reviews(
     if not current_user.is_admin and not current_user.is_hr_admin:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
     
-    reviews = await performance_crud.bulk_create_reviews(
-        db,
-        review_data=review_data,
-        created_by=current_user.id,
-        company_id=current_user.company_id
+    if not review_data.get("employee_ids") and not review_data.get("department_id"):
+        raise HTTPException(status_code=400, detail="employee_ids or department_id is required")
+    
+    try:
+        review_ids = await performance_crud.bulk_create_reviews(
+            db,
+            review_data=review_data,
+            created_by=current_user.id,
+            company_id=current_user.company_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if return_mode == "count":
+        return {"created_count": len(review_ids)}
+    
+    # Freshly created reviews have no goals yet
+    reviews = await performance_crud.get_reviews_by_ids(
+        db, review_ids=review_ids, company_id=current_user.company_id, include_goals=False
     )
-    return {"created_count": len(reviews), "reviews": reviews}
+    return {"created_count": len(review_ids), "reviews": reviews}
+
+
+EXPORT_TASK = "app.tasks.reports.export_performance_review"
+# Matches Celery's default result_expires; job ids are unknown after that
+EXPORT_JOB_SECONDS = 60 * 60 * 24
+
+
+def _export_job_key(job_id: str) -> str:
+    return f"perf:export:{job_id}"
+
 
+def _export_job_state(job_id: str):
+    """Fetch export job state and result from the Celery result backend"""
+    job = AsyncResult(job_id, app=celery_app)
+    state = job.state
+    return state, job.result if state == "SUCCESS" else None
 
-@router.get("/reviews/{review_id}/export")
+
+@router.get("/reviews/{review_id}/export", status_code=202)
 async def export_performance_review(
     review_id: int,
     format: str = Query("pdf"),
     db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    """Export performance review to PDF or Excel"""
+    """Queue a PDF or Excel export of a performance review"""
     # Validate format
     if format not in ["pdf", "excel"]:
         raise HTTPException(status_code=400, detail="Format must be 'pdf' or 'excel'")
@@ -310,15 +400,50 @@ async def export_performance_review(
     if not review:
         raise HTTPException(status_code=404, detail="Performance review not found")
     
-    # Implementation for PDF/Excel export would go here
-    # For now, return review data that can be processed by frontend
+    # Rendering happens in a worker; only the serialized review is enqueued
+    payload = PerformanceResponse.model_validate(review).model_dump(mode="json")
+    # Record the owning company before queueing so status lookups can be scoped
+    job_id = str(uuid.uuid4())
+    await redis_manager.set_cache(_export_job_key(job_id), current_user.company_id, expire=EXPORT_JOB_SECONDS)
+    await run_in_threadpool(
+        celery_app.send_task, EXPORT_TASK, args=[payload, format, current_user.company_id], task_id=job_id
+    )
     return {
-        "review": review,
+        "job_id": job_id,
+        "status": "queued",
         "format": format,
-        "message": f"Review exported in {format} format"
+        "status_url": f"{settings.API_V1_STR}/performance/exports/{job_id}"
     }
 
 
+@router.get("/exports/{job_id}")
+async def get_export_status(
+    job_id: str,
+    response: Response,
+    current_user = Depends(get_current_user)
+):
+    """Get the status of a review export job and its download URL once ready"""
+    # Unknown, expired and other tenants' jobs all look the same: not found
+    owner = await redis_manager.get_cache(_export_job_key(job_id))
+    if owner is None or int(owner) != current_user.company_id:
+        raise HTTPException(status_code=404, detail="Export job not found")
+    
+    state, result = await run_in_threadpool(_export_job_state, job_id)
+    
+    if state == "SUCCESS":
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "format": result["format"],
+            "url": result["url"]
+        }
+    if state == "FAILURE":
+        return {"job_id": job_id, "status": "failed"}
+    
+    response.status_code = 202
+    return {"job_id": job_id, "status": state.lower()}
+
+
 # Advanced Performance Management Features
 
 @router.post("/reviews/{review_id}/360-feedback")
@@ -343,33 +468,34 @@ async def submit_360_feedback(
     }
 
 
+# The framework doesn't vary by role or level yet, so serialize it once at import time
+_COMPETENCY_FRAMEWORK_BODY = orjson.dumps({
+    "technical_competencies": [
+        {"name": "Technical Expertise", "description": "Depth of technical knowledge", "weight": 30},
+        {"name": "Problem Solving", "description": "Ability to solve complex problems", "weight": 25},
+        {"name": "Innovation", "description": "Creative thinking and innovation", "weight": 20}
+    ],
+    "behavioral_competencies": [
+        {"name": "Communication", "description": "Effective communication skills", "weight": 15},
+        {"name": "Teamwork", "description": "Collaboration and team contribution", "weight": 20},
+        {"name": "Leadership", "description": "Leadership and mentoring abilities", "weight": 25}
+    ],
+    "business_competencies": [
+        {"name": "Business Acumen", "description": "Understanding of business context", "weight": 20},
+        {"name": "Customer Focus", "description": "Customer-centric approach", "weight": 15},
+        {"name": "Results Orientation", "description": "Focus on achieving results", "weight": 25}
+    ]
+})
+
+
 @router.get("/competencies")
 async def get_competency_framework(
     job_level: Optional[str] = Query(None),
     department: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """Get competency framework for performance evaluation"""
-    # Return competency frameworks based on role/level
-    competencies = {
-        "technical_competencies": [
-            {"name": "Technical Expertise", "description": "Depth of technical knowledge", "weight": 30},
-            {"name": "Problem Solving", "description": "Ability to solve complex problems", "weight": 25},
-            {"name": "Innovation", "description": "Creative thinking and innovation", "weight": 20}
-        ],
-        "behavioral_competencies": [
-            {"name": "Communication", "description": "Effective communication skills", "weight": 15},
-            {"name": "Teamwork", "description": "Collaboration and team contribution", "weight": 20},
-            {"name": "Leadership", "description": "Leadership and mentoring abilities", "weight": 25}
-        ],
-        "business_competencies": [
-            {"name": "Business Acumen", "description": "Understanding of business context", "weight": 20},
-            {"name": "Customer Focus", "description": "Customer-centric approach", "weight": 15},
-            {"name": "Results Orientation", "description": "Focus on achieving results", "weight": 25}
-        ]
-    }
-    return competencies
+    return Response(content=_COMPETENCY_FRAMEWORK_BODY, media_type="application/json")
 
 
 @router.post("/reviews/{review_id}/competency-assessment")
@@ -399,7 +525,7 @@ async def get_development_plan(
 ):
     """Get individual development plan based on performance review"""
     review = await performance_crud.get_review_by_id(
-        db, review_id=review_id, company_id=current_user.company_id
+        db, review_id=review_id, company_id=current_user.company_id, include_goals=False
     )
     if not review:
         raise HTTPException(status_code=404, detail="Performance review not found")
@@ -580,21 +706,53 @@ async def get_performance_trends(
     return trends_data
 
 
+BULK_EMAIL_TASK = "app.tasks.email.send_bulk_email"
+
+REMINDER_MESSAGES = {
+    ReminderType.DUE_SOON: (
+        "Performance review due soon",
+        "A performance review assigned to you is due soon. Please log in to complete it."
+    ),
+    ReminderType.OVERDUE: (
+        "Performance review overdue",
+        "A performance review assigned to you is past its due date. Please log in to complete it."
+    ),
+    ReminderType.SELF_ASSESSMENT: (
+        "Self-assessment pending",
+        "Your self-assessment for the current performance review is pending. Please log in to complete it."
+    ),
+    ReminderType.MANAGER_REVIEW: (
+        "Manager review pending",
+        "A manager review for the current performance cycle is pending. Please log in to complete it."
+    ),
+}
+
+
 @router.post("/reviews/remind")
 async def send_review_reminders(
-    reminder_data: dict,
-    db: AsyncSession = Depends(get_db),
+    reminder_data: ReviewReminderRequest,
+    db: AsyncSession = Depends(get_db_ro),
     current_user = Depends(get_current_user)
 ):
-    """Send automated reminders for pending performance reviews"""
-    # Implementation for automated reminders
-    reminder_type = reminder_data.get('type')  # due_soon, overdue, self_assessment, manager_review
-    recipients = reminder_data.get('recipients', [])
+    """Queue reminders for employees with pending performance reviews"""
+    if not current_user.is_admin and not current_user.is_hr_admin:
+        raise HTTPException(status_code=403, detail="Insufficient permissions")
+    
+    # Only employees of this company with an open review get a reminder
+    emails = await performance_crud.get_reminder_recipients(
+        db, employee_ids=reminder_data.recipients, company_id=current_user.company_id
+    )
+    if emails:
+        subject, body = REMINDER_MESSAGES[reminder_data.type]
+        await run_in_threadpool(
+            celery_app.send_task, BULK_EMAIL_TASK, args=[list(emails), subject, body]
+        )
     
     return {
-        "message": f"Reminders sent successfully",
-        "type": reminder_type,
-        "recipients_count": len(recipients)
+        "message": "Reminders queued",
+        "type": reminder_data.type,
+        "recipients_count": len(reminder_data.recipients),
+        "queued_count": len(emails)
     }
 
 
@@ -1,158 +1,186 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.middleware.auth import get_current_user
+from app.core.database import get_db, get_db_ro
+from app.api.deps import get_current_user
 from app.models.user import User
+import orjson
 
 router = APIRouter()
 
+ReportFormat = Literal["json", "pdf", "excel"]
+
+# Placeholder payloads are static, so serialize them once at import time
+_EMPLOYEE_REPORT_BODY = orjson.dumps({
+    "report_type": "employee",
+    "data": {
+        "total_employees": 0,
+        "active_employees": 0,
+        "new_hires": 0,
+        "terminations": 0,
+        "by_department": []
+    },
+    "generated_at": "2025-07-13T15:41:00Z"
+})
+
+_ATTENDANCE_REPORT_BODY = orjson.dumps({
+    "report_type": "attendance",
+    "data": {
+        "total_working_days": 0,
+        "average_attendance": 0,
+        "late_arrivals": 0,
+        "early_departures": 0,
+        "overtime_hours": 0
+    },
+    "generated_at": "2025-07-13T15:41:00Z"
+})
+
+_PAYROLL_REPORT_BODY = orjson.dumps({
+    "report_type": "payroll",
+    "data": {
+        "total_payroll": 0,
+        "average_salary": 0,
+        "total_deductions": 0,
+        "total_benefits": 0,
+        "by_department": []
+    },
+    "generated_at": "2025-07-13T15:41:00Z"
+})
+
+_PERFORMANCE_REPORT_BODY = orjson.dumps({
+    "report_type": "performance",
+    "data": {
+        "completed_reviews": 0,
+        "pending_reviews": 0,
+        "average_rating": 0,
+        "goal_completion_rate": 0,
+        "by_department": []
+    },
+    "generated_at": "2025-07-13T15:41:00Z"
+})
+
+_LEAVE_REPORT_BODY = orjson.dumps({
+    "report_type": "leave",
+    "data": {
+        "total_leave_days": 0,
+        "approved_leaves": 0,
+        "pending_leaves": 0,
+        "rejected_leaves": 0,
+        "by_leave_type": []
+    },
+    "generated_at": "2025-07-13T15:41:00Z"
+})
+
+_EXPENSE_REPORT_BODY = orjson.dumps({
+    "report_type": "expense",
+    "data": {
+        "total_expenses": 0,
+        "approved_expenses": 0,
+        "pending_expenses": 0,
+        "rejected_expenses": 0,
+        "by_category": []
+    },
+    "generated_at": "2025-07-13T15:41:00Z"
+})
+
+_CUSTOM_REPORTS_BODY = orjson.dumps({"reports": []})
+
+_SCHEDULED_REPORTS_BODY = orjson.dumps({"scheduled_reports": []})
+
+_ANALYTICS_OVERVIEW_BODY = orjson.dumps({
+    "employees": {"total": 0, "growth_rate": 0},
+    "attendance": {"rate": 0, "trend": "stable"},
+    "performance": {"average_rating": 0, "improvement": 0},
+    "expenses": {"total": 0, "budget_utilization": 0}
+})
+
+
 @router.get("/employee-report")
 async def get_employee_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     department_id: Optional[int] = Query(None),
-    format: str = Query("json", regex="^(json|pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    format: ReportFormat = Query("json"),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Generate employee report."""
     # Placeholder implementation
-    return {
-        "report_type": "employee",
-        "data": {
-            "total_employees": 0,
-            "active_employees": 0,
-            "new_hires": 0,
-            "terminations": 0,
-            "by_department": []
-        },
-        "generated_at": "2025-07-13T15:41:00Z"
-    }
+    return Response(content=_EMPLOYEE_REPORT_BODY, media_type="application/json")
 
 @router.get("/attendance-report")
 async def get_attendance_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     employee_id: Optional[int] = Query(None),
-    format: str = Query("json", regex="^(json|pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    format: ReportFormat = Query("json"),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Generate attendance report."""
     # Placeholder implementation
-    return {
-        "report_type": "attendance",
-        "data": {
-            "total_working_days": 0,
-            "average_attendance": 0,
-            "late_arrivals": 0,
-            "early_departures": 0,
-            "overtime_hours": 0
-        },
-        "generated_at": "2025-07-13T15:41:00Z"
-    }
+    return Response(content=_ATTENDANCE_REPORT_BODY, media_type="application/json")
 
 @router.get("/payroll-report")
 async def get_payroll_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     department_id: Optional[int] = Query(None),
-    format: str = Query("json", regex="^(json|pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    format: ReportFormat = Query("json"),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Generate payroll report."""
     # Placeholder implementation
-    return {
-        "report_type": "payroll",
-        "data": {
-            "total_payroll": 0,
-            "average_salary": 0,
-            "total_deductions": 0,
-            "total_benefits": 0,
-            "by_department": []
-        },
-        "generated_at": "2025-07-13T15:41:00Z"
-    }
+    return Response(content=_PAYROLL_REPORT_BODY, media_type="application/json")
 
 @router.get("/performance-report")
 async def get_performance_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     department_id: Optional[int] = Query(None),
-    format: str = Query("json", regex="^(json|pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    format: ReportFormat = Query("json"),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Generate performance report."""
     # Placeholder implementation
-    return {
-        "report_type": "performance",
-        "data": {
-            "completed_reviews": 0,
-            "pending_reviews": 0,
-            "average_rating": 0,
-            "goal_completion_rate": 0,
-            "by_department": []
-        },
-        "generated_at": "2025-07-13T15:41:00Z"
-    }
+    return Response(content=_PERFORMANCE_REPORT_BODY, media_type="application/json")
 
 @router.get("/leave-report")
 async def get_leave_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     leave_type: Optional[str] = Query(None),
-    format: str = Query("json", regex="^(json|pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    format: ReportFormat = Query("json"),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Generate leave report."""
     # Placeholder implementation
-    return {
-        "report_type": "leave",
-        "data": {
-            "total_leave_days": 0,
-            "approved_leaves": 0,
-            "pending_leaves": 0,
-            "rejected_leaves": 0,
-            "by_leave_type": []
-        },
-        "generated_at": "2025-07-13T15:41:00Z"
-    }
+    return Response(content=_LEAVE_REPORT_BODY, media_type="application/json")
 
 @router.get("/expense-report")
 async def get_expense_report(
     start_date: Optional[str] = Query(None),
     end_date: Optional[str] = Query(None),
     category: Optional[str] = Query(None),
-    format: str = Query("json", regex="^(json|pdf|excel)$"),
-    db: AsyncSession = Depends(get_db),
+    format: ReportFormat = Query("json"),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Generate expense report."""
     # Placeholder implementation
-    return {
-        "report_type": "expense",
-        "data": {
-            "total_expenses": 0,
-            "approved_expenses": 0,
-            "pending_expenses": 0,
-            "rejected_expenses": 0,
-            "by_category": []
-        },
-        "generated_at": "2025-07-13T15:41:00Z"
-    }
+    return Response(content=_EXPENSE_REPORT_BODY, media_type="application/json")
 
 @router.get("/custom-reports")
 async def get_custom_reports(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Get custom reports."""
     # Placeholder implementation
-    return {"reports": []}
+    return Response(content=_CUSTOM_REPORTS_BODY, media_type="application/json")
 
 @router.post("/custom-reports")
 async def create_custom_report(
@@ -166,12 +194,12 @@ async def create_custom_report(
 
 @router.get("/scheduled-reports")
 async def get_scheduled_reports(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Get scheduled reports."""
     # Placeholder implementation
-    return {"scheduled_reports": []}
+    return Response(content=_SCHEDULED_REPORTS_BODY, media_type="application/json")
 
 @router.post("/scheduled-reports")
 async def schedule_report(
@@ -185,14 +213,9 @@ async def schedule_report(
 
 @router.get("/analytics/overview")
 async def get_analytics_overview(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_db_ro),
     current_user: User = Depends(get_current_user)
 ):
     """Get analytics overview."""
     # Placeholder implementation
-    return {
-        "employees": {"total": 0, "growth_rate": 0},
-        "attendance": {"rate": 0, "trend": "stable"},
-        "performance": {"average_rating": 0, "improvement": 0},
-        "expenses": {"total": 0, "budget_utilization": 0}
-    }
+    return Response(content=_ANALYTICS_OVERVIEW_BODY, media_type="application/json")
@@ -1,8 +1,8 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.database import get_db
-from app.models.user import User
+from app.core.database import get_db, get_db_ro
+from app.models.user import User, UserRole, UserStatus
 
 router = APIRouter()
 
@@ -11,9 +11,9 @@ async def get_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     search: Optional[str] = Query(None),
-    role: Optional[str] = Query(None),
-    status: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    role: Optional[UserRole] = Query(None),
+    status: Optional[UserStatus] = Query(None),
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Get all users with filtering."""
     # Placeholder implementation
@@ -36,7 +36,7 @@ async def create_user(
 @router.get("/{user_id}")
 async def get_user(
     user_id: int,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Get a specific user by ID."""
     # Placeholder implementation
@@ -73,7 +73,7 @@ async def get_available_roles():
 
 @router.get("/stats/summary")
 async def get_user_stats(
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_db_ro)
 ):
     """Get user statistics summary."""
     # Placeholder implementation
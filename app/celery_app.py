@@ -11,6 +11,7 @@ celery_app = Celery(
         "app.tasks.attendance",
         "app.tasks.email",
         "app.tasks.reports",
+        "app.tasks.performance",
         "app.tasks.compliance"
     ]
 )
@@ -35,6 +36,10 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.attendance.process_daily_attendance',
         'schedule': 60.0 * 60 * 24,  # Daily at midnight
     },
+    'ensure-punch-partitions': {
+        'task': 'app.tasks.attendance.ensure_punch_partitions',
+        'schedule': 60.0 * 60 * 24,  # Daily
+    },
     'generate-monthly-payroll': {
         'task': 'app.tasks.payroll.generate_monthly_payroll',
         'schedule': 60.0 * 60 * 24 * 30,  # Monthly
@@ -43,6 +48,10 @@ celery_app.conf.beat_schedule = {
         'task': 'app.tasks.email.send_leave_reminders',
         'schedule': 60.0 * 60 * 24,  # Daily
     },
+    'refresh-performance-analytics': {
+        'task': 'app.tasks.performance.refresh_performance_analytics',
+        'schedule': 60.0 * 5,  # Every 5 minutes
+    },
     'backup-database': {
         'task': 'app.tasks.compliance.backup_database',
         'schedule': 60.0 * 60 * 12,  # Twice daily
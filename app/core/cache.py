@@ -0,0 +1,37 @@
+"""
+HTTP caching helpers for read-heavy endpoints
+"""
+
+from typing import Any
+from fastapi import Request, Response
+import hashlib
+import orjson
+
+# Browser revalidation window for per-user dashboard JSON
+CLIENT_CACHE_SECONDS = 30
+
+
+def conditional_json_response(
+    request: Request,
+    content: Any,
+    max_age: int = CLIENT_CACHE_SECONDS
+) -> Response:
+    """
+    JSON response with a content-hash ETag and a short private Cache-Control.
+
+    Returns an empty 304 when the client's If-None-Match already holds the
+    current ETag, so unchanged dashboards skip the download.
+    """
+    body = orjson.dumps(content, option=orjson.OPT_SORT_KEYS)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={max_age}",
+        "Vary": "Authorization",
+    }
+    
+    if_none_match = request.headers.get("if-none-match", "")
+    client_etags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if etag in client_etags or "*" in client_etags:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -17,6 +17,15 @@ class Settings(BaseSettings):
     DATABASE_URL: str
     DATABASE_POOL_SIZE: int = 20
     DATABASE_MAX_OVERFLOW: int = 30
+    DATABASE_READ_URL: Optional[str] = None  # Read replica; reads share the primary pool when unset
+    DATABASE_READ_POOL_SIZE: int = 20  # Replica pool only; keep workers x (size + overflow) under its max_connections
+    DATABASE_READ_MAX_OVERFLOW: int = 30
+    DATABASE_POOL_TIMEOUT: int = 5
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds; stay under proxy/LB idle timeouts
+    DATABASE_SLOW_QUERY_SECONDS: float = 0.05
+    # asyncpg prepared statement cache per connection; set to 0 behind PgBouncer transaction pooling
+    DATABASE_STATEMENT_CACHE_SIZE: int = 1024
+    DATABASE_INSERTMANYVALUES_PAGE_SIZE: int = 1000
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379/0"
@@ -28,11 +37,15 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    BCRYPT_ROUNDS: int = 12  # Calibrate so one verify stays well under the login latency budget
     
     # CORS
     ALLOWED_ORIGINS: List[str] = ["http://localhost:3000"]
     ALLOWED_HOSTS: List[str] = ["*"]
     
+    # Response compression (off by default; nginx compresses in front of the API)
+    ENABLE_GZIP: bool = False
+    
     # File Storage
     AWS_ACCESS_KEY_ID: Optional[str] = None
     AWS_SECRET_ACCESS_KEY: Optional[str] = None
@@ -1,21 +1,70 @@
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 from sqlalchemy.pool import NullPool
+from sqlalchemy import event, text
 from app.core.config import settings
+from datetime import date
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 
-# Create async engine with connection pooling for high load
-engine = create_async_engine(
+def _create_engine(url: str, pool_size: int, max_overflow: int):
+    """Create an async engine with the shared pooling, caching and slow-query settings"""
+    if settings.ENV == "test":
+        pool_options = {"poolclass": NullPool}
+    else:
+        pool_options = {
+            "pool_size": pool_size,
+            "max_overflow": max_overflow,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,  # Fail fast under bursts
+            "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+        }
+    
+    async_engine = create_async_engine(
+        url,
+        pool_pre_ping=True,
+        query_cache_size=1200,  # Compiled SQL cache shared by all sessions
+        # Batched executemany: INSERTs go out as multi-row VALUES pages of this size
+        use_insertmanyvalues=True,
+        insertmanyvalues_page_size=settings.DATABASE_INSERTMANYVALUES_PAGE_SIZE,
+        connect_args={
+            "statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+            "prepared_statement_cache_size": settings.DATABASE_STATEMENT_CACHE_SIZE,
+        },
+        **pool_options,
+    )
+    
+    # Log only slow statements instead of echoing every query
+    @event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+    def _start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        context._query_start_time = time.perf_counter()
+    
+    @event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+    def _log_slow_query(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._query_start_time
+        if elapsed > settings.DATABASE_SLOW_QUERY_SECONDS:
+            logger.warning("Slow query (%.3fs): %s", elapsed, statement[:200])
+    
+    return async_engine
+
+
+# Primary engine for writes. Reads get their own pool only when a replica is
+# configured; without one they share the primary pool so a worker never holds
+# more than DATABASE_POOL_SIZE + DATABASE_MAX_OVERFLOW connections to it
+engine = _create_engine(
     settings.DATABASE_URL,
-    poolclass=NullPool if settings.ENV == "test" else None,
-    pool_size=settings.DATABASE_POOL_SIZE,
-    max_overflow=settings.DATABASE_MAX_OVERFLOW,
-    pool_pre_ping=True,
-    pool_recycle=3600,  # Recycle connections every hour
-    echo=settings.DEBUG,
+    settings.DATABASE_POOL_SIZE,
+    settings.DATABASE_MAX_OVERFLOW,
 )
+if settings.DATABASE_READ_URL:
+    read_engine = _create_engine(
+        settings.DATABASE_READ_URL,
+        settings.DATABASE_READ_POOL_SIZE,
+        settings.DATABASE_READ_MAX_OVERFLOW,
+    )
+else:
+    read_engine = engine
 
 # Create session factory
 AsyncSessionLocal = async_sessionmaker(
@@ -24,6 +73,14 @@ AsyncSessionLocal = async_sessionmaker(
     expire_on_commit=False,
 )
 
+# Read-only session factory: no autoflush since nothing is written
+AsyncSessionReadOnly = async_sessionmaker(
+    read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+    autoflush=False,
+)
+
 Base = declarative_base()
 
 
@@ -40,6 +97,12 @@ async def get_db() -> AsyncSession:
             await session.close()
 
 
+async def get_db_ro() -> AsyncSession:
+    """Dependency to get a read-only database session for GET endpoints"""
+    async with AsyncSessionReadOnly() as session:
+        yield session
+
+
 async def init_db():
     """Initialize database"""
     async with engine.begin() as conn:
@@ -49,4 +112,24 @@ async def init_db():
             leave, expense, performance, asset, document,
             benefits, compliance, onboarding
         )
+        # Trigram operator classes used by the employee search index
+        await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         await conn.run_sync(Base.metadata.create_all)
+        # Asset tags are unique per company (idx_asset_company_tag); drop the
+        # old global unique constraint that duplicated it on existing databases
+        await conn.execute(text("ALTER TABLE assets DROP CONSTRAINT IF EXISTS assets_asset_tag_key"))
+        for statement in employee.employee_upgrade_ddl():
+            await conn.execute(text(statement))
+        for statement in user.user_upgrade_ddl():
+            await conn.execute(text(statement))
+        duplicates = (await conn.execute(text(user.case_duplicate_emails_sql))).scalars().all()
+        if duplicates:
+            logger.warning(f"Users with emails differing only by case need merging: {duplicates}")
+        for statement in attendance.attendance_upgrade_ddl():
+            await conn.execute(text(statement))
+        await conn.execute(text(attendance.punch_partitions_ddl(
+            date.today(), attendance.PUNCH_PARTITION_MONTHS_AHEAD
+        )))
+        # Materialized views live outside the ORM metadata
+        for statement in performance.performance_analytics_ddl():
+            await conn.execute(text(statement))
@@ -0,0 +1,79 @@
+"""
+Outbound email helpers
+"""
+
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+from app.core.config import settings
+from typing import List, Optional
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Recipients per SMTP message (sent as BCC) and concurrent SMTP sends
+BULK_EMAIL_CHUNK_SIZE = 100
+BULK_EMAIL_CONCURRENCY = 10
+
+_mailer: Optional[FastMail] = None
+
+
+def get_mailer() -> FastMail:
+    """Get the shared mail client"""
+    global _mailer
+    if _mailer is None:
+        _mailer = FastMail(
+            ConnectionConfig(
+                MAIL_USERNAME=settings.MAIL_USERNAME,
+                MAIL_PASSWORD=settings.MAIL_PASSWORD,
+                MAIL_FROM=settings.MAIL_FROM,
+                MAIL_FROM_NAME=settings.MAIL_FROM_NAME,
+                MAIL_PORT=settings.MAIL_PORT,
+                MAIL_SERVER=settings.MAIL_SERVER,
+                MAIL_STARTTLS=True,
+                MAIL_SSL_TLS=False,
+            )
+        )
+    return _mailer
+
+
+async def send_bulk_email(
+    recipients: List[str],
+    subject: str,
+    body: str,
+    chunk_size: int = BULK_EMAIL_CHUNK_SIZE,
+    concurrency: int = BULK_EMAIL_CONCURRENCY
+) -> int:
+    """
+    Send the same message to many recipients.
+
+    Recipients are grouped into BCC chunks so each SMTP transaction covers
+    up to ``chunk_size`` addresses, and at most ``concurrency`` chunks are
+    in flight at once. A failed chunk is logged and does not abort the rest.
+    Returns the number of recipients whose chunk was accepted.
+    """
+    mailer = get_mailer()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send_chunk(chunk: List[str]) -> int:
+        async with semaphore:
+            await mailer.send_message(
+                MessageSchema(
+                    recipients=[settings.MAIL_FROM],
+                    bcc=chunk,
+                    subject=subject,
+                    body=body,
+                    subtype=MessageType.plain,
+                )
+            )
+        return len(chunk)
+
+    chunks = [recipients[i:i + chunk_size] for i in range(0, len(recipients), chunk_size)]
+    results = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks), return_exceptions=True)
+
+    sent = 0
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error(f"Bulk email chunk failed: {result}")
+        else:
+            sent += result
+    return sent
@@ -0,0 +1,25 @@
+"""
+Keyset pagination helpers
+"""
+
+from typing import Any, Dict
+import base64
+import json
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode the last-seen sort key of a page as an opaque URL-safe cursor"""
+    raw = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor; raises ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if not isinstance(values, dict):
+        raise ValueError("Invalid pagination cursor")
+    return values
@@ -1,15 +1,25 @@
 import redis.asyncio as redis
+from contextlib import asynccontextmanager
 from app.core.config import settings
-import json
+import orjson
 import logging
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
+from urllib.parse import urlparse
 
 logger = logging.getLogger(__name__)
 
 
+def _dumps(value: Any) -> bytes:
+    """Serialize a cache/session value; int dict keys are stringified like stdlib json"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+
+
 class RedisManager:
     def __init__(self):
         self.redis_pool = None
+        self.client: Optional[redis.Redis] = None
+        self.session_pool = None
+        self.session_client: Optional[redis.Redis] = None
     
     async def init_redis(self):
         """Initialize Redis connection pool"""
@@ -20,28 +30,65 @@ class RedisManager:
                 decode_responses=True,
                 max_connections=100  # For high load
             )
+            # Shared client; the pool owns the sockets and commands are multiplexed over it
+            self.client = redis.Redis(connection_pool=self.redis_pool)
+            # Sessions get their own pool pinned to REDIS_SESSION_DB so no pooled
+            # connection ever has its database switched with SELECT
+            self.session_pool = redis.ConnectionPool.from_url(
+                urlparse(settings.REDIS_URL)._replace(path=f"/{settings.REDIS_SESSION_DB}").geturl(),
+                encoding="utf-8",
+                decode_responses=True,
+                max_connections=50
+            )
+            self.session_client = redis.Redis(connection_pool=self.session_pool)
             logger.info("Redis connection pool initialized")
         except Exception as e:
             logger.error(f"Failed to initialize Redis: {e}")
             raise
     
     async def get_redis(self) -> redis.Redis:
-        """Get Redis connection"""
-        if not self.redis_pool:
+        """Get the shared Redis client"""
+        if not self.client:
+            await self.init_redis()
+        return self.client
+    
+    async def ping(self) -> bool:
+        """Check Redis connectivity"""
+        redis_client = await self.get_redis()
+        try:
+            return await redis_client.ping()
+        except Exception as e:
+            logger.error(f"Redis ping error: {e}")
+            return False
+    
+    async def get_session_redis(self) -> redis.Redis:
+        """Get the shared Redis client for the session database"""
+        if not self.session_client:
             await self.init_redis()
-        return redis.Redis(connection_pool=self.redis_pool)
+        return self.session_client
+    
+    async def close(self):
+        """Close the shared clients and their connection pools"""
+        if self.client:
+            await self.client.close()
+            await self.redis_pool.disconnect()
+            self.client = None
+            self.redis_pool = None
+        if self.session_client:
+            await self.session_client.close()
+            await self.session_pool.disconnect()
+            self.session_client = None
+            self.session_pool = None
     
     async def set_cache(self, key: str, value: Any, expire: int = 3600):
         """Set cache with expiration"""
         redis_client = await self.get_redis()
         try:
             if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+                value = _dumps(value)
             await redis_client.set(key, value, ex=expire)
         except Exception as e:
             logger.error(f"Cache set error: {e}")
-        finally:
-            await redis_client.close()
     
     async def get_cache(self, key: str) -> Optional[Any]:
         """Get cache value"""
@@ -50,15 +97,20 @@ class RedisManager:
             value = await redis_client.get(key)
             if value:
                 try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
+                    return orjson.loads(value)
+                except orjson.JSONDecodeError:
                     return value
             return None
         except Exception as e:
             logger.error(f"Cache get error: {e}")
             return None
-        finally:
-            await redis_client.close()
+    
+    @asynccontextmanager
+    async def pipeline(self) -> AsyncIterator[redis.client.Pipeline]:
+        """Queue commands on the shared client and send them in one round-trip on execute()"""
+        redis_client = await self.get_redis()
+        async with redis_client.pipeline(transaction=False) as pipe:
+            yield pipe
     
     async def delete_cache(self, key: str):
         """Delete cache key"""
@@ -67,33 +119,32 @@ class RedisManager:
             await redis_client.delete(key)
         except Exception as e:
             logger.error(f"Cache delete error: {e}")
-        finally:
-            await redis_client.close()
     
     async def set_session(self, session_id: str, data: dict, expire: int = 86400):
         """Set session data"""
-        redis_client = await self.get_redis()
+        redis_client = await self.get_session_redis()
         try:
-            await redis_client.select(settings.REDIS_SESSION_DB)
-            await redis_client.set(f"session:{session_id}", json.dumps(data), ex=expire)
+            await redis_client.set(f"session:{session_id}", _dumps(data), ex=expire)
         except Exception as e:
             logger.error(f"Session set error: {e}")
-        finally:
-            await redis_client.close()
     
     async def get_session(self, session_id: str) -> Optional[dict]:
         """Get session data"""
-        redis_client = await self.get_redis()
+        redis_client = await self.get_session_redis()
         try:
-            await redis_client.select(settings.REDIS_SESSION_DB)
             data = await redis_client.get(f"session:{session_id}")
-            return json.loads(data) if data else None
+            return orjson.loads(data) if data else None
         except Exception as e:
             logger.error(f"Session get error: {e}")
             return None
-        finally:
-            await redis_client.close()
-
+    
+    async def delete_session(self, session_id: str):
+        """Delete session data"""
+        redis_client = await self.get_session_redis()
+        try:
+            await redis_client.delete(f"session:{session_id}")
+        except Exception as e:
+            logger.error(f"Session delete error: {e}")
 
 # Global Redis manager instance
 redis_manager = RedisManager()
@@ -0,0 +1,57 @@
+"""
+Per-request memoization of point lookups
+
+RequestCacheMiddleware opens a fresh cache for every HTTP request, so cached
+rows never outlive the request that loaded them. Outside a request (Celery
+tasks, scripts) nothing is cached.
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+_request_cache: ContextVar[Optional[Dict[Any, Any]]] = ContextVar("request_cache", default=None)
+
+
+def start_request_cache():
+    """Open an empty cache for the current request; returns a token for end_request_cache"""
+    return _request_cache.set({})
+
+
+def end_request_cache(token) -> None:
+    """Drop the current request's cache"""
+    _request_cache.reset(token)
+
+
+def request_cached(func: Callable) -> Callable:
+    """
+    Memoize a CRUD lookup for the rest of the request.
+
+    Entries are keyed by session, model, method and arguments, so an instance is
+    only ever handed back to the session that loaded it. Misses (None) are not
+    cached because the row may be created later in the same request.
+    """
+    @wraps(func)
+    async def wrapper(self, db, *args, **kwargs):
+        cache = _request_cache.get()
+        if cache is None:
+            return await func(self, db, *args, **kwargs)
+        
+        key = (db, self.model, func.__name__, args, tuple(sorted(kwargs.items())))
+        if key in cache:
+            return cache[key]
+        
+        result = await func(self, db, *args, **kwargs)
+        if result is not None:
+            cache[key] = result
+        return result
+    
+    return wrapper
+
+
+def invalidate_request_cache(model) -> None:
+    """Forget cached lookups for a model after it is written in this request"""
+    cache = _request_cache.get()
+    if cache:
+        for key in [key for key in cache if key[1] is model]:
+            del cache[key]
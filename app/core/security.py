@@ -1,13 +1,46 @@
 from passlib.context import CryptContext
-from jose import JWTError, jwt
+import jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from app.core.config import settings
+from app.core.redis import redis_manager
+from cachetools import TTLCache
+import asyncio
+import hashlib
 import secrets
 import string
+import logging
+import orjson
+import threading
+import time
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+# Password hashing: one shared context, built once at import. Existing hashes keep
+# verifying at whatever cost they were created with.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+)
+
+# Decoded JWT payloads keyed by token digest. Entries live at most TOKEN_CACHE_TTL
+# seconds and are never served past the token's own exp claim.
+TOKEN_CACHE_TTL = 60
+_token_cache: TTLCache = TTLCache(maxsize=50_000, ttl=TOKEN_CACHE_TTL)
+_token_cache_lock = threading.Lock()
+
+# Revocation answers per token jti, so most requests skip the Redis blacklist
+# lookup. Every revocation is published on REVOCATION_CHANNEL and each worker's
+# RevocationListener marks the token revoked locally; "not revoked" answers are
+# only served from the cache while that subscription is up.
+REVOCATION_CACHE_TTL = 30
+REVOCATION_CHANNEL = "auth:revoked"
+_revocation_cache: TTLCache = TTLCache(maxsize=10_000, ttl=REVOCATION_CACHE_TTL)
+
+
+def _token_digest(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -20,15 +53,38 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in a worker thread so bcrypt doesn't block the event loop"""
+    return await asyncio.to_thread(pwd_context.verify, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """Hash a password in a worker thread so bcrypt doesn't block the event loop"""
+    return await asyncio.to_thread(pwd_context.hash, password)
+
+
+_dummy_password_hash: Optional[str] = None
+
+
+async def averify_dummy_password(plain_password: str) -> bool:
+    """Spend the same bcrypt time as a real check when there is no account; always False"""
+    global _dummy_password_hash
+    if _dummy_password_hash is None:
+        _dummy_password_hash = await aget_password_hash(secrets.token_urlsafe(16))
+    await averify_password(plain_password, _dummy_password_hash)
+    return False
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     """Create JWT access token"""
     to_encode = data.copy()
     if expires_delta:
-        expire = datetime.utcnow() + expires_delta
+        expires_in = int(expires_delta.total_seconds())
     else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+        expires_in = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
     
-    to_encode.update({"exp": expire})
+    to_encode["exp"] = int(time.time()) + expires_in
+    to_encode["jti"] = secrets.token_hex(8)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
@@ -36,25 +92,183 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
 def create_refresh_token(data: dict):
     """Create JWT refresh token"""
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire})
+    to_encode["exp"] = int(time.time()) + settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+    to_encode["jti"] = secrets.token_hex(8)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
 def verify_token(token: str) -> Optional[dict]:
-    """Verify and decode JWT token"""
+    """Verify and decode JWT token, reusing recent verifications of the same token"""
+    cache_key = _token_digest(token)
+    with _token_cache_lock:
+        payload = _token_cache.get(cache_key)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
-    except JWTError:
+    except jwt.InvalidTokenError:
         return None
+    
+    with _token_cache_lock:
+        _token_cache[cache_key] = payload
+    return payload
+
+
+def _revocation_key(payload: dict) -> str:
+    """Blacklist key for a verified token: its short jti claim"""
+    # Tokens issued before jti was added fall back to subject + expiry
+    jti = payload.get("jti") or f"{payload.get('sub')}:{payload.get('exp')}"
+    return f"bl:{jti}"
+
+
+class RevocationListener:
+    """Applies revocations published by any worker to this worker's revocation cache"""
+
+    RECONNECT_DELAY_SECONDS = 1.0
+
+    def __init__(self):
+        self.subscribed = False
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self) -> None:
+        """Start the subscription loop"""
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the subscription loop"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            pubsub = None
+            try:
+                redis_client = await redis_manager.get_redis()
+                pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+                await pubsub.subscribe(REVOCATION_CHANNEL)
+                # Revocations published while unsubscribed were missed; drop every
+                # cached answer so the next check goes back to Redis
+                _revocation_cache.clear()
+                self.subscribed = True
+                async for message in pubsub.listen():
+                    _revocation_cache[message["data"]] = True
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Revocation listener error: {e}")
+            finally:
+                self.subscribed = False
+                if pubsub is not None:
+                    await pubsub.reset()
+            await asyncio.sleep(self.RECONNECT_DELAY_SECONDS)
+
+
+revocation_listener = RevocationListener()
+
+
+def _cached_revocation(key: str) -> Optional[bool]:
+    """Locally cached revocation answer, or None when Redis has to be asked"""
+    revoked = _revocation_cache.get(key)
+    if revoked is False and not revocation_listener.subscribed:
+        return None
+    return revoked
+
+
+def _cache_revocation(key: str, revoked: bool) -> None:
+    # setdefault keeps a revocation that arrived while Redis was being read
+    _revocation_cache.setdefault(key, revoked)
+
+
+async def is_token_revoked(payload: dict) -> bool:
+    """Check the blacklist for a verified token, answering from the local cache when possible"""
+    key = _revocation_key(payload)
+    revoked = _cached_revocation(key)
+    if revoked is None:
+        revoked = bool(await redis_manager.get_cache(key))
+        _cache_revocation(key, revoked)
+    return revoked
+
+
+async def revoke_token(payload: dict) -> None:
+    """Blacklist a verified token until it would have expired anyway and tell every worker"""
+    key = _revocation_key(payload)
+    expire = max(int(payload.get("exp", 0) - time.time()), 1)
+    await redis_manager.set_cache(key, "1", expire=expire)
+    _revocation_cache[key] = True
+    try:
+        redis_client = await redis_manager.get_redis()
+        await redis_client.publish(REVOCATION_CHANNEL, key)
+    except Exception as e:
+        logger.error(f"Revocation publish error: {e}")
+
+
+# Authenticated users are cached in Redis for this long (see CRUDUser.get_cached)
+USER_CACHE_SECONDS = 60
+
+
+def user_cache_key(user_id) -> str:
+    return f"user:{user_id}"
+
+
+async def load_auth_state(payload: dict, *, check_revoked: bool = True) -> Tuple[bool, Optional[dict]]:
+    """
+    Revocation flag and cached user row for a verified token.
+
+    When the revocation answer is not known locally, the blacklist and user
+    reads are pipelined into one Redis round trip. Pass ``check_revoked=False``
+    when AuthMiddleware has already checked the token.
+    """
+    revoked_key = _revocation_key(payload)
+    user_key = user_cache_key(payload.get("sub"))
+    revoked = _cached_revocation(revoked_key) if check_revoked else False
+    if revoked is not None:
+        return revoked, await redis_manager.get_cache(user_key)
+    
+    try:
+        async with redis_manager.pipeline() as pipe:
+            pipe.get(revoked_key)
+            pipe.get(user_key)
+            revoked_value, user_value = await pipe.execute()
+    except Exception as e:
+        # Same fail-open behaviour as get_cache; nothing is cached locally
+        logger.error(f"Auth state lookup error: {e}")
+        return False, None
+    
+    revoked = bool(revoked_value)
+    _cache_revocation(revoked_key, revoked)
+    return revoked, orjson.loads(user_value) if user_value else None
+
+
+_RANDOM_ALPHABET = (string.ascii_letters + string.digits).encode()
+# Largest multiple of len(alphabet) below 256; bytes at or above it are
+# rejected so every character stays equally likely
+_RANDOM_BYTE_LIMIT = 256 - 256 % len(_RANDOM_ALPHABET)
 
 
 def generate_random_string(length: int = 32) -> str:
-    """Generate random string for various purposes"""
-    alphabet = string.ascii_letters + string.digits
-    return ''.join(secrets.choice(alphabet) for _ in range(length))
+    """Generate random alphanumeric string for various purposes"""
+    # Map whole batches of random bytes onto the alphabet instead of one
+    # secrets.choice() call per character
+    chars = bytearray()
+    while len(chars) < length:
+        chars.extend(
+            _RANDOM_ALPHABET[byte % len(_RANDOM_ALPHABET)]
+            for byte in secrets.token_bytes(length + 8)
+            if byte < _RANDOM_BYTE_LIMIT
+        )
+    return chars[:length].decode()
 
 
 def generate_employee_id(company_id: int, department_code: str = "EMP") -> str:
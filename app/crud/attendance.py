@@ -1,18 +1,22 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, text
+from sqlalchemy import select, and_, or_, func, text, case
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date, timedelta
 from decimal import Decimal
 
+from app.core.pagination import encode_cursor, decode_cursor
 from app.crud.base import CRUDBase
-from app.models.attendance import Attendance, AttendancePunch, PunchType
+from app.models.attendance import Attendance, AttendancePunch, AttendanceStatus, PunchType
 from app.models.employee import Employee
 from app.schemas.attendance import AttendanceCreate, AttendanceUpdate
 import logging
 
 logger = logging.getLogger(__name__)
 
+MICROSECONDS_PER_HOUR = Decimal(3_600_000_000)
+
 
 class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
     
@@ -21,6 +25,7 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         db: AsyncSession,
         *,
         employee_id: int,
+        company_id: int,
         punch_type: PunchType,
         latitude: Optional[float] = None,
         longitude: Optional[float] = None,
@@ -32,20 +37,51 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         punch_time = datetime.utcnow()
         today = punch_time.date()
         
-        # Get or create today's attendance record
-        attendance = await self.get_attendance_by_date(db, employee_id=employee_id, date=today)
-        if not attendance:
-            attendance = Attendance(
-                employee_id=employee_id,
-                date=today,
-                company_id=1  # This should come from employee's company
+        # Get or create today's attendance record and apply the punch in one UPSERT
+        values = {"employee_id": employee_id, "date": today, "company_id": company_id}
+        if punch_type == PunchType.PUNCH_IN:
+            values.update(
+                punch_in_time=punch_time,
+                punch_in_latitude=latitude,
+                punch_in_longitude=longitude
+            )
+        elif punch_type == PunchType.PUNCH_OUT:
+            values.update(
+                punch_out_time=punch_time,
+                punch_out_latitude=latitude,
+                punch_out_longitude=longitude
             )
-            db.add(attendance)
-            await db.flush()
+        
+        stmt = pg_insert(Attendance).values(**values)
+        excluded = stmt.excluded
+        set_ = {"updated_at": func.statement_timestamp()}
+        if punch_type == PunchType.PUNCH_IN:
+            # The first punch in of the day wins
+            first_punch_in = Attendance.punch_in_time.is_(None)
+            set_.update(
+                punch_in_time=func.coalesce(Attendance.punch_in_time, excluded.punch_in_time),
+                punch_in_latitude=case((first_punch_in, excluded.punch_in_latitude), else_=Attendance.punch_in_latitude),
+                punch_in_longitude=case((first_punch_in, excluded.punch_in_longitude), else_=Attendance.punch_in_longitude)
+            )
+        elif punch_type == PunchType.PUNCH_OUT:
+            # Calculate total hours if punch in exists
+            worked_hours = func.extract("epoch", excluded.punch_out_time - Attendance.punch_in_time) / 3600
+            set_.update(
+                punch_out_time=excluded.punch_out_time,
+                punch_out_latitude=excluded.punch_out_latitude,
+                punch_out_longitude=excluded.punch_out_longitude,
+                total_hours=func.coalesce(worked_hours, Attendance.total_hours)
+            )
+        
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["employee_id", "date"],
+            set_=set_
+        ).returning(Attendance.id)
+        attendance_id = (await db.execute(stmt)).scalar_one()
         
         # Create punch record
         punch = AttendancePunch(
-            attendance_id=attendance.id,
+            attendance_id=attendance_id,
             employee_id=employee_id,
             punch_type=punch_type,
             punch_time=punch_time,
@@ -56,25 +92,7 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
             is_valid_location=True  # Location validation would be done in the calling function
         )
         db.add(punch)
-        
-        # Update attendance record based on punch type
-        if punch_type == PunchType.PUNCH_IN:
-            if not attendance.punch_in_time:
-                attendance.punch_in_time = punch_time
-                attendance.punch_in_latitude = latitude
-                attendance.punch_in_longitude = longitude
-        elif punch_type == PunchType.PUNCH_OUT:
-            attendance.punch_out_time = punch_time
-            attendance.punch_out_latitude = latitude
-            attendance.punch_out_longitude = longitude
-            
-            # Calculate total hours if both punch in/out exist
-            if attendance.punch_in_time:
-                time_diff = punch_time - attendance.punch_in_time
-                attendance.total_hours = Decimal(str(time_diff.total_seconds() / 3600))
-        
         await db.commit()
-        await db.refresh(punch)
         
         return punch
     
@@ -103,21 +121,54 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         employee_id: int,
         start_date: Optional[date] = None,
         end_date: Optional[date] = None,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[Attendance]:
-        """Get attendance records for an employee within date range"""
-        query = select(Attendance).where(Attendance.employee_id == employee_id)
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get attendance records for an employee within date range.
+
+        Records are returned newest first. Pass the returned cursor back to
+        fetch the next page; it is None when there are no more records.
+        ``skip`` is only honoured when no cursor is given. Rows are plain
+        mappings of the columns AttendanceResponse exposes, so no
+        relationship can be lazy-loaded during serialization.
+        """
+        query = select(
+            Attendance.id,
+            Attendance.employee_id,
+            Attendance.date,
+            Attendance.punch_in_time,
+            Attendance.punch_out_time,
+            Attendance.total_hours,
+            Attendance.overtime_hours,
+            Attendance.status,
+            Attendance.is_late.label("is_late"),
+            Attendance.late_minutes,
+            Attendance.early_departure.label("early_departure"),
+            Attendance.early_departure_minutes
+        ).where(Attendance.employee_id == employee_id)
         
         if start_date:
             query = query.where(Attendance.date >= start_date)
         if end_date:
             query = query.where(Attendance.date <= end_date)
+        if cursor:
+            # (employee_id, date) is unique, so the date alone is a stable seek key
+            query = query.where(Attendance.date < date.fromisoformat(decode_cursor(cursor)["d"]))
+        elif skip:
+            query = query.offset(skip)
         
-        query = query.order_by(Attendance.date.desc()).offset(skip).limit(limit)
+        query = query.order_by(Attendance.date.desc()).limit(limit + 1)
         
         result = await db.execute(query)
-        return result.scalars().all()
+        records = result.mappings().all()
+        
+        next_cursor = None
+        if len(records) > limit:
+            records = records[:limit]
+            next_cursor = encode_cursor({"d": records[-1]["date"].isoformat()})
+        return records, next_cursor
     
     async def get_team_attendance(
         self,
@@ -131,10 +182,17 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
     ) -> List[Dict[str, Any]]:
         """Get team attendance for a specific date"""
         query = select(
-            Attendance,
+            Attendance.employee_id,
+            Attendance.date,
+            Attendance.punch_in_time,
+            Attendance.punch_out_time,
+            Attendance.total_hours,
+            Attendance.status,
+            Attendance.is_late.label("is_late"),
+            Attendance.late_minutes,
             Employee.first_name,
             Employee.last_name,
-            Employee.employee_id,
+            Employee.employee_id.label("employee_code"),
             Employee.job_title
         ).join(
             Employee, Attendance.employee_id == Employee.id
@@ -150,27 +208,24 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         
         query = query.offset(skip).limit(limit)
         
+        # Plain column rows: no ORM instances are built for this read-only view
         result = await db.execute(query)
-        records = result.all()
-        
-        team_attendance = []
-        for record in records:
-            attendance, first_name, last_name, emp_id, job_title = record
-            team_attendance.append({
-                "employee_id": attendance.employee_id,
-                "employee_name": f"{first_name} {last_name}",
-                "employee_code": emp_id,
-                "job_title": job_title,
-                "date": attendance.date,
-                "punch_in_time": attendance.punch_in_time,
-                "punch_out_time": attendance.punch_out_time,
-                "total_hours": attendance.total_hours,
-                "status": attendance.status,
-                "is_late": attendance.is_late,
-                "late_minutes": attendance.late_minutes
-            })
-        
-        return team_attendance
+        return [
+            {
+                "employee_id": row["employee_id"],
+                "employee_name": f"{row['first_name']} {row['last_name']}",
+                "employee_code": row["employee_code"],
+                "job_title": row["job_title"],
+                "date": row["date"],
+                "punch_in_time": row["punch_in_time"],
+                "punch_out_time": row["punch_out_time"],
+                "total_hours": row["total_hours"],
+                "status": row["status"],
+                "is_late": row["is_late"],
+                "late_minutes": row["late_minutes"]
+            }
+            for row in result.mappings().all()
+        ]
     
     async def manual_adjustment(
         self,
@@ -198,8 +253,8 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         
         # Recalculate hours if both manual times are provided
         if attendance.manual_punch_in and attendance.manual_punch_out:
-            time_diff = attendance.manual_punch_out - attendance.manual_punch_in
-            attendance.total_hours = Decimal(str(time_diff.total_seconds() / 3600))
+            microseconds = (attendance.manual_punch_out - attendance.manual_punch_in) // timedelta(microseconds=1)
+            attendance.total_hours = (Decimal(microseconds) / MICROSECONDS_PER_HOUR).quantize(Decimal("0.01"))
         
         await db.commit()
         await db.refresh(attendance)
@@ -220,8 +275,17 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         if not end_date:
             end_date = date.today()
         
-        # Base query
-        query = select(Attendance).where(
+        # Aggregate in the database; a single row comes back
+        query = select(
+            func.count().label("total_days"),
+            func.count().filter(Attendance.status == AttendanceStatus.PRESENT).label("present_days"),
+            func.count().filter(Attendance.status == AttendanceStatus.ABSENT).label("absent_days"),
+            func.count().filter(Attendance.is_late).label("late_days"),
+            func.count().filter(Attendance.status == AttendanceStatus.HALF_DAY).label("half_days"),
+            func.count().filter(Attendance.status == AttendanceStatus.ON_LEAVE).label("leave_days"),
+            func.coalesce(func.sum(Attendance.total_hours), 0).label("total_hours"),
+            func.coalesce(func.sum(Attendance.overtime_hours), 0).label("overtime_hours")
+        ).where(
             and_(
                 Attendance.employee_id == employee_id,
                 Attendance.date >= start_date,
@@ -230,18 +294,16 @@ class CRUDAttendance(CRUDBase[Attendance, AttendanceCreate, AttendanceUpdate]):
         )
         
         result = await db.execute(query)
-        records = result.scalars().all()
-        
-        # Calculate statistics
-        total_days = len(records)
-        present_days = len([r for r in records if r.status == "present"])
-        absent_days = len([r for r in records if r.status == "absent"])
-        late_days = len([r for r in records if r.is_late])
-        half_days = len([r for r in records if r.status == "half_day"])
-        leave_days = len([r for r in records if r.status == "on_leave"])
+        stats = result.one()
         
-        total_hours = sum([r.total_hours or 0 for r in records])
-        overtime_hours = sum([r.overtime_hours or 0 for r in records])
+        total_days = stats.total_days
+        present_days = stats.present_days
+        absent_days = stats.absent_days
+        late_days = stats.late_days
+        half_days = stats.half_days
+        leave_days = stats.leave_days
+        total_hours = stats.total_hours
+        overtime_hours = stats.overtime_hours
         
         avg_hours = total_hours / total_days if total_days > 0 else 0
         punctuality_percentage = ((total_days - late_days) / total_days * 100) if total_days > 0 else 0
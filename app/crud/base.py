@@ -1,15 +1,56 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
-from fastapi.encoders import jsonable_encoder
+from typing import Any, AsyncIterator, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, func
+from sqlalchemy import select, insert, update, delete, exists, func, inspect, lambda_stmt, tuple_
 from sqlalchemy.orm import selectinload
 from app.core.database import Base
+from app.core.pagination import encode_cursor, decode_cursor
+from app.core.request_cache import request_cached, invalidate_request_cache
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Postgres caps a single statement at 32767 bind parameters
+MAX_BIND_PARAMS = 32767
+
+# Rows fetched per round-trip when streaming through a server-side cursor
+STREAM_BATCH_SIZE = 1000
+
+
+def contains_pattern(term: str) -> str:
+    """LIKE/ILIKE pattern matching term anywhere, with wildcards in term escaped (escape char is backslash)"""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _as_dict(obj_in: Union[BaseModel, Dict[str, Any]]) -> Dict[str, Any]:
+    """Column values for an insert, keeping native Python types (datetime, Decimal, enums)"""
+    if isinstance(obj_in, dict):
+        return dict(obj_in)
+    return obj_in.model_dump()
+
+
+async def update_returning(
+    db: AsyncSession,
+    model: Type[ModelType],
+    record_id: int,
+    values: Dict[str, Any]
+) -> Optional[ModelType]:
+    """Update a record by ID with one UPDATE ... RETURNING and commit; None if it does not exist"""
+    if not values:
+        result = await db.execute(select(model).where(model.id == record_id))
+        return result.scalars().first()
+    
+    result = await db.execute(
+        update(model).where(model.id == record_id).values(**values).returning(model)
+    )
+    db_obj = result.scalars().first()
+    if db_obj:
+        await db.commit()
+        invalidate_request_cache(model)
+    return db_obj
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model: Type[ModelType]):
@@ -20,31 +61,112 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         * `schema`: A Pydantic model (schema) class
         """
         self.model = model
+        # Filterable columns resolved once per model instead of per request
+        self._columns = {key: getattr(model, key) for key in inspect(model).columns.keys()}
+
+    def _filter_conditions(self, filters: Optional[Dict[str, Any]]) -> list:
+        """Build equality conditions for filters that name a model column; unknown keys are ignored"""
+        if not filters:
+            return []
+        return [
+            self._columns[key] == value
+            for key, value in filters.items()
+            if key in self._columns
+        ]
 
     async def get(self, db: AsyncSession, id: Any) -> Optional[ModelType]:
         """Get a single record by ID"""
-        result = await db.execute(select(self.model).where(self.model.id == id))
+        # lambda_stmt caches the statement construction; id becomes a bound parameter
+        model = self.model
+        result = await db.execute(lambda_stmt(lambda: select(model).where(model.id == id)))
         return result.scalars().first()
 
+    async def get_many_by_ids(self, db: AsyncSession, ids: Sequence[int]) -> Dict[int, ModelType]:
+        """Get records for many IDs with one IN query per chunk, keyed by ID; missing IDs are absent"""
+        unique_ids = list(dict.fromkeys(ids))
+        records = {}
+        for i in range(0, len(unique_ids), MAX_BIND_PARAMS):
+            result = await db.execute(
+                select(self.model).where(self.model.id.in_(unique_ids[i:i + MAX_BIND_PARAMS]))
+            )
+            records.update((obj.id, obj) for obj in result.scalars().all())
+        return records
+
+    def _seek_page(
+        self,
+        query,
+        sort_column,
+        *,
+        cursor: Optional[str] = None,
+        skip: int = 0,
+        limit: int = 100
+    ):
+        """
+        Order a query newest first by (sort_column, id) and fetch one page.
+
+        With a cursor the query seeks past the last row of the previous page
+        so the index is used instead of reading and discarding ``skip`` rows.
+        One extra row is fetched so _page_cursor can tell if another page exists.
+        """
+        if cursor:
+            values = decode_cursor(cursor)
+            last_key = sort_column.type.python_type.fromisoformat(values["k"])
+            query = query.where(tuple_(sort_column, self.model.id) < tuple_(last_key, values["id"]))
+        elif skip:
+            query = query.offset(skip)
+        return query.order_by(sort_column.desc(), self.model.id.desc()).limit(limit + 1)
+
+    def _page_cursor(
+        self,
+        rows: List[ModelType],
+        sort_column,
+        limit: int
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Trim the look-ahead row of a _seek_page result and build the next cursor"""
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor({"k": getattr(last, sort_column.key).isoformat(), "id": last.id})
+
     async def get_multi(
         self, 
         db: AsyncSession, 
         *, 
+        cursor: Optional[str] = None,
         skip: int = 0, 
         limit: int = 100,
         filters: Optional[Dict[str, Any]] = None
-    ) -> List[ModelType]:
-        """Get multiple records with pagination and filters"""
-        query = select(self.model)
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):
-                    query = query.where(getattr(self.model, key) == value)
-        
-        query = query.offset(skip).limit(limit)
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """Get multiple records newest first with keyset pagination and filters"""
+        query = select(self.model).where(*self._filter_conditions(filters))
+        query = self._seek_page(query, self.model.created_at, cursor=cursor, skip=skip, limit=limit)
         result = await db.execute(query)
-        return result.scalars().all()
+        return self._page_cursor(result.scalars().all(), self.model.created_at, limit)
+
+    async def iter_multi(
+        self,
+        db: AsyncSession,
+        *,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[ModelType]:
+        """
+        Stream every matching record, oldest first, for exports and batch jobs.
+
+        Rows come from a server-side cursor ``batch_size`` at a time, so memory
+        stays flat however many records match. Interactive lists should keep
+        using get_multi.
+        """
+        query = (
+            select(self.model)
+            .where(*self._filter_conditions(filters))
+            .order_by(self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        result = await db.stream(query)
+        async for obj in result.scalars():
+            yield obj
 
     async def count(
         self, 
@@ -52,13 +174,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         filters: Optional[Dict[str, Any]] = None
     ) -> int:
         """Count records with optional filters"""
-        query = select(func.count()).select_from(self.model)
-        
-        if filters:
-            for key, value in filters.items():
-                if hasattr(self.model, key):
-                    query = query.where(getattr(self.model, key) == value)
-        
+        query = select(func.count()).select_from(self.model).where(*self._filter_conditions(filters))
         result = await db.execute(query)
         return result.scalar()
 
@@ -69,10 +185,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: CreateSchemaType
     ) -> ModelType:
         """Create a new record"""
-        obj_in_data = jsonable_encoder(obj_in)
-        db_obj = self.model(**obj_in_data)
+        db_obj = self.model(**_as_dict(obj_in))
         db.add(db_obj)
         await db.commit()
+        invalidate_request_cache(self.model)
         await db.refresh(db_obj)
         return db_obj
 
@@ -84,29 +200,33 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         obj_in: Union[UpdateSchemaType, Dict[str, Any]]
     ) -> ModelType:
         """Update an existing record"""
-        obj_data = jsonable_encoder(db_obj)
         if isinstance(obj_in, dict):
             update_data = obj_in
         else:
-            update_data = obj_in.dict(exclude_unset=True)
+            update_data = obj_in.model_dump(exclude_unset=True)
         
-        for field in obj_data:
-            if field in update_data:
-                setattr(db_obj, field, update_data[field])
+        for field, value in update_data.items():
+            if field in self._columns:
+                setattr(db_obj, field, value)
         
         db.add(db_obj)
         await db.commit()
+        invalidate_request_cache(self.model)
         await db.refresh(db_obj)
         return db_obj
 
-    async def remove(self, db: AsyncSession, *, id: int) -> ModelType:
-        """Delete a record by ID"""
-        obj = await self.get(db, id=id)
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[ModelType]:
+        """Delete a record by ID and return it"""
+        result = await db.execute(
+            delete(self.model).where(self.model.id == id).returning(self.model)
+        )
+        obj = result.scalars().first()
         if obj:
-            await db.delete(obj)
             await db.commit()
+            invalidate_request_cache(self.model)
         return obj
 
+    @request_cached
     async def get_by_field(
         self, 
         db: AsyncSession, 
@@ -114,9 +234,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         field_value: Any
     ) -> Optional[ModelType]:
         """Get a record by any field"""
-        if hasattr(self.model, field_name):
-            query = select(self.model).where(getattr(self.model, field_name) == field_value)
-            result = await db.execute(query)
+        column = self._columns.get(field_name)
+        if column is not None:
+            model = self.model
+            result = await db.execute(lambda_stmt(lambda: select(model).where(column == field_value)))
             return result.scalars().first()
         return None
 
@@ -126,15 +247,10 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         filters: Dict[str, Any]
     ) -> bool:
         """Check if a record exists with given filters"""
-        query = select(func.count()).select_from(self.model)
-        
-        for key, value in filters.items():
-            if hasattr(self.model, key):
-                query = query.where(getattr(self.model, key) == value)
-        
+        # EXISTS lets the planner stop at the first matching row instead of counting them all
+        query = select(exists().where(*self._filter_conditions(filters)).select_from(self.model))
         result = await db.execute(query)
-        count = result.scalar()
-        return count > 0
+        return bool(result.scalar())
 
     async def bulk_create(
         self, 
@@ -143,18 +259,21 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         objs_in: List[CreateSchemaType]
     ) -> List[ModelType]:
         """Create multiple records in bulk"""
+        payload = [_as_dict(obj_in) for obj_in in objs_in]
+        if not payload:
+            return []
+        
+        # One multi-row INSERT ... RETURNING per chunk (insertmanyvalues), kept
+        # under the Postgres bind parameter limit for wide models
+        chunk_size = max(1, MAX_BIND_PARAMS // len(self.model.__table__.columns))
+        stmt = insert(self.model).returning(self.model)
         db_objs = []
-        for obj_in in objs_in:
-            obj_in_data = jsonable_encoder(obj_in)
-            db_obj = self.model(**obj_in_data)
-            db_objs.append(db_obj)
+        for i in range(0, len(payload), chunk_size):
+            result = await db.execute(stmt, payload[i:i + chunk_size])
+            db_objs.extend(result.scalars().all())
         
-        db.add_all(db_objs)
         await db.commit()
-        
-        for db_obj in db_objs:
-            await db.refresh(db_obj)
-        
+        invalidate_request_cache(self.model)
         return db_objs
 
     async def bulk_update(
@@ -164,19 +283,16 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         updates: List[Dict[str, Any]]
     ) -> bool:
         """Update multiple records in bulk"""
+        rows = [update_data for update_data in updates if 'id' in update_data]
+        if not rows:
+            return True
+        
         try:
-            for update_data in updates:
-                if 'id' not in update_data:
-                    continue
-                
-                record_id = update_data.pop('id')
-                await db.execute(
-                    update(self.model)
-                    .where(self.model.id == record_id)
-                    .values(**update_data)
-                )
-            
+            # ORM bulk UPDATE by primary key: rows are grouped by their key set and
+            # each group is sent as one executemany instead of a round-trip per row
+            await db.execute(update(self.model), rows)
             await db.commit()
+            invalidate_request_cache(self.model)
             return True
         except Exception:
             await db.rollback()
@@ -2,13 +2,13 @@
 Benefits administration CRUD operations
 """
 
-from typing import List, Optional, Dict, Any
+from typing import Iterable, List, Optional, Dict, Any
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, desc
+from sqlalchemy import select, or_, func, desc
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, update_returning
 from app.models.benefits import (
     EmployeeBenefitPlan, BenefitEnrollment, BenefitDependent, BenefitOpenEnrollment,
     BenefitType, BenefitStatus, EnrollmentStatus
@@ -26,7 +26,7 @@ async def create_benefit_plan(
     plan: BenefitPlanCreate
 ) -> EmployeeBenefitPlan:
     """Create benefit plan"""
-    db_obj = EmployeeBenefitPlan(**plan.dict())
+    db_obj = EmployeeBenefitPlan(**plan.model_dump())
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
@@ -39,20 +39,24 @@ async def get_benefit_plans(
     benefit_type: Optional[BenefitType] = None,
     is_active: bool = True,
     skip: int = 0,
-    limit: int = 100
+    limit: int = 100,
+    load: Iterable[str] = ()
 ) -> List[EmployeeBenefitPlan]:
     """Get benefit plans"""
-    query = select(EmployeeBenefitPlan).where(
-        and_(
-            EmployeeBenefitPlan.company_id == company_id,
-            EmployeeBenefitPlan.is_active == is_active
-        )
-    )
-    
+    filters = [
+        EmployeeBenefitPlan.company_id == company_id,
+        EmployeeBenefitPlan.is_active == is_active
+    ]
     if benefit_type:
-        query = query.where(EmployeeBenefitPlan.benefit_type == benefit_type)
+        filters.append(EmployeeBenefitPlan.benefit_type == benefit_type)
     
-    query = query.offset(skip).limit(limit)
+    query = (
+        select(EmployeeBenefitPlan)
+        .options(*[selectinload(getattr(EmployeeBenefitPlan, rel)) for rel in load])
+        .where(*filters)
+        .offset(skip)
+        .limit(limit)
+    )
     result = await db.execute(query)
     return result.scalars().all()
 
@@ -63,19 +67,7 @@ async def update_benefit_plan(
     plan_update: BenefitPlanUpdate
 ) -> Optional[EmployeeBenefitPlan]:
     """Update benefit plan"""
-    result = await db.execute(select(EmployeeBenefitPlan).where(EmployeeBenefitPlan.id == plan_id))
-    db_obj = result.scalars().first()
-    
-    if not db_obj:
-        return None
-    
-    update_data = plan_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    
-    await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    return await update_returning(db, EmployeeBenefitPlan, plan_id, plan_update.model_dump(exclude_unset=True))
 
 
 # Benefit Enrollment CRUD
@@ -84,7 +76,7 @@ async def create_enrollment(
     enrollment: BenefitEnrollmentCreate
 ) -> BenefitEnrollment:
     """Create benefit enrollment"""
-    db_obj = BenefitEnrollment(**enrollment.dict())
+    db_obj = BenefitEnrollment(**enrollment.model_dump())
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
@@ -100,16 +92,24 @@ async def get_enrollments(
     limit: int = 100
 ) -> List[BenefitEnrollment]:
     """Get benefit enrollments"""
-    query = select(BenefitEnrollment)
-    
+    filters = []
     if employee_id:
-        query = query.where(BenefitEnrollment.employee_id == employee_id)
+        filters.append(BenefitEnrollment.employee_id == employee_id)
     if plan_id:
-        query = query.where(BenefitEnrollment.plan_id == plan_id)
+        filters.append(BenefitEnrollment.plan_id == plan_id)
     if status:
-        query = query.where(BenefitEnrollment.status == status)
+        filters.append(BenefitEnrollment.status == status)
     
-    query = query.offset(skip).limit(limit)
+    query = (
+        select(BenefitEnrollment)
+        .options(
+            selectinload(BenefitEnrollment.benefit_plan),
+            selectinload(BenefitEnrollment.employee)
+        )
+        .where(*filters)
+        .offset(skip)
+        .limit(limit)
+    )
     result = await db.execute(query)
     return result.scalars().all()
 
@@ -120,19 +120,7 @@ async def update_enrollment(
     enrollment_update: BenefitEnrollmentUpdate
 ) -> Optional[BenefitEnrollment]:
     """Update benefit enrollment"""
-    result = await db.execute(select(BenefitEnrollment).where(BenefitEnrollment.id == enrollment_id))
-    db_obj = result.scalars().first()
-    
-    if not db_obj:
-        return None
-    
-    update_data = enrollment_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    
-    await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    return await update_returning(db, BenefitEnrollment, enrollment_id, enrollment_update.model_dump(exclude_unset=True))
 
 
 # Open Enrollment CRUD
@@ -141,7 +129,7 @@ async def create_open_enrollment(
     open_enrollment: OpenEnrollmentCreate
 ) -> BenefitOpenEnrollment:
     """Create open enrollment period"""
-    db_obj = BenefitOpenEnrollment(**open_enrollment.dict())
+    db_obj = BenefitOpenEnrollment(**open_enrollment.model_dump())
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
@@ -157,16 +145,19 @@ async def get_open_enrollments(
     limit: int = 100
 ) -> List[BenefitOpenEnrollment]:
     """Get open enrollment periods"""
-    query = select(BenefitOpenEnrollment).where(
-        and_(
-            BenefitOpenEnrollment.company_id == company_id,
-            BenefitOpenEnrollment.is_active == is_active
-        )
-    )
-    
+    filters = [
+        BenefitOpenEnrollment.company_id == company_id,
+        BenefitOpenEnrollment.is_active == is_active
+    ]
     if year:
-        query = query.where(BenefitOpenEnrollment.enrollment_year == year)
+        filters.append(BenefitOpenEnrollment.enrollment_year == year)
     
-    query = query.order_by(desc(BenefitOpenEnrollment.enrollment_year)).offset(skip).limit(limit)
+    query = (
+        select(BenefitOpenEnrollment)
+        .where(*filters)
+        .order_by(desc(BenefitOpenEnrollment.enrollment_year))
+        .offset(skip)
+        .limit(limit)
+    )
     result = await db.execute(query)
     return result.scalars().all()
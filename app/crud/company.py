@@ -3,49 +3,53 @@ CRUD operations for Company model
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func
-from app.crud.base import CRUDBase
+from sqlalchemy import select, or_, func, bindparam, lambda_stmt
+from app.core.request_cache import request_cached
+from app.crud.base import CRUDBase, contains_pattern
 from app.models.company import Company
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from datetime import datetime
 
 
 class CRUDCompany(CRUDBase[Company, dict, dict]):
     """Company CRUD operations"""
     
+    @request_cached
     async def get_by_name(self, db: AsyncSession, *, name: str) -> Optional[Company]:
         """Get company by name"""
-        result = await db.execute(select(Company).where(Company.name == name))
+        result = await db.execute(lambda_stmt(lambda: select(Company).where(Company.name == name)))
         return result.scalars().first()
     
+    @request_cached
     async def get_by_registration_number(self, db: AsyncSession, *, registration_number: str) -> Optional[Company]:
         """Get company by registration number"""
-        result = await db.execute(select(Company).where(Company.registration_number == registration_number))
+        result = await db.execute(lambda_stmt(lambda: select(Company).where(Company.registration_number == registration_number)))
         return result.scalars().first()
     
     async def get_multi_with_filters(
         self,
         db: AsyncSession,
         *,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100,
         search: Optional[str] = None,
         industry: Optional[str] = None,
         size: Optional[str] = None,
         status: Optional[str] = None
-    ) -> List[Company]:
-        """Get companies with filters"""
-        query = select(Company)
-        
+    ) -> Tuple[List[Company], Optional[str]]:
+        """Get companies with filters, newest first, with keyset pagination"""
         # Apply filters
         filters = []
         
         if search:
+            # One bound pattern shared by all three columns
+            pattern = bindparam("search_pattern", contains_pattern(search))
             filters.append(
                 or_(
-                    Company.name.ilike(f"%{search}%"),
-                    Company.legal_name.ilike(f"%{search}%"),
-                    Company.email.ilike(f"%{search}%")
+                    Company.name.ilike(pattern, escape="\\"),
+                    Company.legal_name.ilike(pattern, escape="\\"),
+                    Company.email.ilike(pattern, escape="\\")
                 )
             )
         
@@ -58,13 +62,10 @@ class CRUDCompany(CRUDBase[Company, dict, dict]):
         if status:
             filters.append(Company.status == status)
         
-        if filters:
-            query = query.where(and_(*filters))
-        
-        query = query.offset(skip).limit(limit).order_by(Company.created_at.desc())
+        query = self._seek_page(select(Company).where(*filters), Company.created_at, cursor=cursor, skip=skip, limit=limit)
         
         result = await db.execute(query)
-        return result.scalars().all()
+        return self._page_cursor(result.scalars().all(), Company.created_at, limit)
     
     async def get_company_stats(self, db: AsyncSession, *, company_id: int) -> Dict[str, Any]:
         """Get company statistics"""
@@ -74,26 +75,20 @@ class CRUDCompany(CRUDBase[Company, dict, dict]):
         from app.models.payroll import Payroll
         from app.models.attendance import Attendance
         
-        # Employee stats
-        total_employees_result = await db.execute(
-            select(func.count(Employee.id)).where(Employee.company_id == company_id)
-        )
-        total_employees = total_employees_result.scalar() or 0
-        
-        active_employees_result = await db.execute(
-            select(func.count(Employee.id)).where(
-                and_(Employee.company_id == company_id, Employee.status == "active")
-            )
-        )
-        active_employees = active_employees_result.scalar() or 0
-        
-        # Department count
-        departments_result = await db.execute(
-            select(func.count(func.distinct(Employee.department_id))).where(
-                and_(Employee.company_id == company_id, Employee.department_id.isnot(None))
-            )
+        # Employee and department counts in a single scan
+        result = await db.execute(
+            select(
+                func.count(Employee.id).label("total_employees"),
+                func.count(Employee.id).filter(Employee.status == "active").label("active_employees"),
+                func.count(func.distinct(Employee.department_id)).filter(
+                    Employee.department_id.isnot(None)
+                ).label("departments")
+            ).where(Employee.company_id == company_id)
         )
-        departments = departments_result.scalar() or 0
+        stats = result.one()
+        total_employees = stats.total_employees or 0
+        active_employees = stats.active_employees or 0
+        departments = stats.departments or 0
         
         return {
             "total_employees": total_employees,
@@ -143,5 +138,5 @@ class CRUDCompany(CRUDBase[Company, dict, dict]):
         return result.scalars().all()
 
 
-company = CRUDCompany(Company)
 company_crud = CRUDCompany(Company)
+company = company_crud
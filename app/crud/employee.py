@@ -3,24 +3,38 @@ CRUD operations for Employee model
 """
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
-from app.crud.base import CRUDBase
-from app.models.employee import Employee
-from typing import Optional, List
-from datetime import datetime
+from sqlalchemy import select, update, func, and_, or_, lambda_stmt
+from sqlalchemy.orm import selectinload
+from app.core.request_cache import request_cached
+from app.crud.base import CRUDBase, contains_pattern
+from app.models.employee import Employee, search_text
+from typing import Iterable, Optional, List, Tuple
+
+# Relationships read by EmployeeResponse (department_name, manager_name, user_email)
+DEFAULT_EMPLOYEE_LOAD = ("department", "manager", "user")
+
+MIN_SEARCH_LENGTH = 3
+MAX_SEARCH_LENGTH = 100
+
+
+def _load_options(load: Iterable[str]) -> list:
+    """Translate relationship names into selectinload options"""
+    return [selectinload(getattr(Employee, rel)) for rel in load]
 
 
 class CRUDEmployee(CRUDBase[Employee, dict, dict]):
     """Employee CRUD operations"""
     
+    @request_cached
     async def get_by_employee_id(self, db: AsyncSession, *, employee_id: str) -> Optional[Employee]:
         """Get employee by employee ID"""
-        result = await db.execute(select(Employee).where(Employee.employee_id == employee_id))
+        result = await db.execute(lambda_stmt(lambda: select(Employee).where(Employee.employee_id == employee_id)))
         return result.scalars().first()
     
+    @request_cached
     async def get_by_user_id(self, db: AsyncSession, *, user_id: int) -> Optional[Employee]:
         """Get employee by user ID"""
-        result = await db.execute(select(Employee).where(Employee.user_id == user_id))
+        result = await db.execute(lambda_stmt(lambda: select(Employee).where(Employee.user_id == user_id)))
         return result.scalars().first()
     
     async def get_by_company(
@@ -28,17 +42,23 @@ class CRUDEmployee(CRUDBase[Employee, dict, dict]):
         db: AsyncSession, 
         *, 
         company_id: int,
+        cursor: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Employee]:
-        """Get employees by company"""
-        result = await db.execute(
+        limit: int = 100,
+        load: Iterable[str] = DEFAULT_EMPLOYEE_LOAD
+    ) -> Tuple[List[Employee], Optional[str]]:
+        """Get employees by company, newest first, with keyset pagination"""
+        query = self._seek_page(
             select(Employee)
             .where(Employee.company_id == company_id)
-            .offset(skip)
-            .limit(limit)
+            .options(*_load_options(load)),
+            Employee.created_at,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
         )
-        return result.scalars().all()
+        result = await db.execute(query)
+        return self._page_cursor(result.scalars().all(), Employee.created_at, limit)
     
     async def get_by_department(
         self, 
@@ -46,12 +66,14 @@ class CRUDEmployee(CRUDBase[Employee, dict, dict]):
         *, 
         department_id: int,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        load: Iterable[str] = DEFAULT_EMPLOYEE_LOAD
     ) -> List[Employee]:
         """Get employees by department"""
         result = await db.execute(
             select(Employee)
             .where(Employee.department_id == department_id)
+            .options(*_load_options(load))
             .offset(skip)
             .limit(limit)
         )
@@ -81,19 +103,34 @@ class CRUDEmployee(CRUDBase[Employee, dict, dict]):
         company_id: int,
         search_term: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        load: Iterable[str] = DEFAULT_EMPLOYEE_LOAD
     ) -> List[Employee]:
-        """Search employees by name, email, or employee ID"""
-        search_filter = or_(
-            Employee.first_name.ilike(f"%{search_term}%"),
-            Employee.last_name.ilike(f"%{search_term}%"),
-            Employee.work_email.ilike(f"%{search_term}%"),
-            Employee.employee_id.ilike(f"%{search_term}%")
-        )
+        """
+        Search employees by name, email, or employee ID.
+
+        Terms of MIN_SEARCH_LENGTH or more match against the concatenated
+        text covered by the trigram index. Shorter terms, which trigrams can't
+        narrow down, fall back to a per-column ILIKE. Long terms are truncated.
+        """
+        term = search_term.strip()[:MAX_SEARCH_LENGTH]
+        pattern = contains_pattern(term)
+        if len(term) >= MIN_SEARCH_LENGTH:
+            search_filter = search_text(
+                Employee.first_name, Employee.last_name, Employee.work_email, Employee.employee_id
+            ).ilike(pattern, escape="\\")
+        else:
+            search_filter = or_(
+                Employee.first_name.ilike(pattern, escape="\\"),
+                Employee.last_name.ilike(pattern, escape="\\"),
+                Employee.work_email.ilike(pattern, escape="\\"),
+                Employee.employee_id.ilike(pattern, escape="\\")
+            )
         
         result = await db.execute(
             select(Employee)
             .where(and_(Employee.company_id == company_id, search_filter))
+            .options(*_load_options(load))
             .offset(skip)
             .limit(limit)
         )
@@ -129,11 +166,15 @@ class CRUDEmployee(CRUDBase[Employee, dict, dict]):
         employee_id: int
     ) -> Optional[Employee]:
         """Update employee last activity timestamp"""
-        employee = await self.get(db, id=employee_id)
+        result = await db.execute(
+            update(Employee)
+            .where(Employee.id == employee_id)
+            .values(updated_at=func.now())
+            .returning(Employee)
+        )
+        employee = result.scalars().first()
         if employee:
-            employee.updated_at = datetime.utcnow()
             await db.commit()
-            await db.refresh(employee)
         return employee
 
 
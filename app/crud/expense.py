@@ -2,13 +2,13 @@
 Expense management CRUD operations
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, desc
+from sqlalchemy import select, delete, and_, or_, func, lambda_stmt
 from sqlalchemy.orm import selectinload
 from datetime import datetime, date
 
-from app.crud.base import CRUDBase
+from app.crud.base import CRUDBase, update_returning
 from app.models.expense import Expense, ExpensePolicy, Project, ExpenseStatus, ExpenseCategory
 from app.schemas.expense import (
     ExpenseCreate, ExpenseUpdate,
@@ -28,7 +28,7 @@ class CRUDExpense(CRUDBase[Expense, ExpenseCreate, ExpenseUpdate]):
     ) -> Expense:
         """Create a new expense"""
         db_obj = Expense(
-            **expense_data.dict(),
+            **expense_data.model_dump(),
             company_id=company_id,
             status=ExpenseStatus.DRAFT
         )
@@ -43,28 +43,33 @@ class CRUDExpense(CRUDBase[Expense, ExpenseCreate, ExpenseUpdate]):
         *,
         employee_id: int,
         company_id: int,
+        cursor: Optional[str] = None,
         skip: int = 0,
         limit: int = 100
-    ) -> List[Expense]:
-        """Get expenses for an employee"""
-        result = await db.execute(
-            select(Expense)
-            .where(
+    ) -> Tuple[List[Expense], Optional[str]]:
+        """Get expenses for an employee, latest expense date first, with keyset pagination"""
+        query = self._seek_page(
+            select(Expense).where(
                 and_(
                     Expense.employee_id == employee_id,
                     Expense.company_id == company_id
                 )
-            )
-            .order_by(desc(Expense.expense_date))
-            .offset(skip)
-            .limit(limit)
+            ),
+            Expense.expense_date,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
         )
-        return result.scalars().all()
+        result = await db.execute(query)
+        return self._page_cursor(result.scalars().all(), Expense.expense_date, limit)
+
+
+# Create global instance
+expense_crud = CRUDExpense(Expense)
 
 
 async def create_expense(db: AsyncSession, expense: ExpenseCreate) -> Expense:
     """Create a new expense"""
-    expense_crud = CRUDExpense(Expense)
     return await expense_crud.create_expense(db, expense_data=expense, company_id=1)
 
 
@@ -76,10 +81,10 @@ async def get_expenses(
 ) -> List[Expense]:
     """Get expenses with optional filtering"""
     if employee_id:
-        expense_crud = CRUDExpense(Expense)
-        return await expense_crud.get_expenses_by_employee(
+        expenses, _ = await expense_crud.get_expenses_by_employee(
             db, employee_id=employee_id, company_id=1, skip=skip, limit=limit
         )
+        return expenses
     
     result = await db.execute(select(Expense).offset(skip).limit(limit))
     return result.scalars().all()
@@ -87,7 +92,7 @@ async def get_expenses(
 
 async def get_expense(db: AsyncSession, expense_id: int) -> Optional[Expense]:
     """Get expense by ID"""
-    result = await db.execute(select(Expense).where(Expense.id == expense_id))
+    result = await db.execute(lambda_stmt(lambda: select(Expense).where(Expense.id == expense_id)))
     return result.scalars().first()
 
 
@@ -97,30 +102,17 @@ async def update_expense(
     expense_update: ExpenseUpdate
 ) -> Optional[Expense]:
     """Update expense"""
-    result = await db.execute(select(Expense).where(Expense.id == expense_id))
-    db_obj = result.scalars().first()
-    
-    if not db_obj:
-        return None
-    
-    update_data = expense_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    
-    await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    return await update_returning(db, Expense, expense_id, expense_update.model_dump(exclude_unset=True))
 
 
 async def delete_expense(db: AsyncSession, expense_id: int) -> bool:
     """Delete expense"""
-    result = await db.execute(select(Expense).where(Expense.id == expense_id))
-    db_obj = result.scalars().first()
-    
-    if not db_obj:
+    result = await db.execute(
+        delete(Expense).where(Expense.id == expense_id).returning(Expense.id)
+    )
+    if result.scalar() is None:
         return False
     
-    await db.delete(db_obj)
     await db.commit()
     return True
 
@@ -131,7 +123,7 @@ async def create_expense_policy(
     policy: ExpensePolicyCreate
 ) -> ExpensePolicy:
     """Create expense policy"""
-    db_obj = ExpensePolicy(**policy.dict())
+    db_obj = ExpensePolicy(**policy.model_dump())
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
@@ -160,25 +152,13 @@ async def update_expense_policy(
     policy_update: ExpensePolicyUpdate
 ) -> Optional[ExpensePolicy]:
     """Update expense policy"""
-    result = await db.execute(select(ExpensePolicy).where(ExpensePolicy.id == policy_id))
-    db_obj = result.scalars().first()
-    
-    if not db_obj:
-        return None
-    
-    update_data = policy_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    
-    await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    return await update_returning(db, ExpensePolicy, policy_id, policy_update.model_dump(exclude_unset=True))
 
 
 # Project CRUD
 async def create_project(db: AsyncSession, project: ProjectCreate) -> Project:
     """Create project"""
-    db_obj = Project(**project.dict())
+    db_obj = Project(**project.model_dump())
     db.add(db_obj)
     await db.commit()
     await db.refresh(db_obj)
@@ -207,16 +187,4 @@ async def update_project(
     project_update: ProjectUpdate
 ) -> Optional[Project]:
     """Update project"""
-    result = await db.execute(select(Project).where(Project.id == project_id))
-    db_obj = result.scalars().first()
-    
-    if not db_obj:
-        return None
-    
-    update_data = project_update.dict(exclude_unset=True)
-    for field, value in update_data.items():
-        setattr(db_obj, field, value)
-    
-    await db.commit()
-    await db.refresh(db_obj)
-    return db_obj
+    return await update_returning(db, Project, project_id, project_update.model_dump(exclude_unset=True))
@@ -1,25 +1,63 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_, func, text, desc
-from sqlalchemy.orm import selectinload
-from datetime import datetime, date, timedelta
+from sqlalchemy import select, insert, update, case, literal, and_, or_, func, text, Integer, Date
+from sqlalchemy.orm import noload, selectinload
+from datetime import date, timedelta
 from decimal import Decimal
 
+from app.core.redis import redis_manager
 from app.crud.base import CRUDBase
 from app.models.performance import (
     Performance, PerformanceGoal, PerformanceTemplate,
-    PerformanceReviewType, ReviewStatus, GoalStatus
+    PerformanceReviewType, ReviewStatus, GoalStatus,
+    performance_analytics_view
 )
 from app.models.employee import Employee
 from app.schemas.performance import (
     PerformanceCreate, PerformanceUpdate,
     PerformanceGoalCreate, PerformanceGoalUpdate,
-    PerformanceTemplateCreate
+    PerformanceTemplateCreate, PerformanceResponse
 )
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Company review list pages are cached briefly; writes bump a per-company version
+REVIEW_LIST_CACHE_SECONDS = 45
+
+
+def _reviews_version_key(company_id: int) -> str:
+    return f"perf:reviews:{company_id}:version"
+
+
+async def _bump_reviews_version(company_id: int) -> None:
+    """Invalidate every cached review list page of a company by moving to a new key version"""
+    try:
+        redis_client = await redis_manager.get_redis()
+        await redis_client.incr(_reviews_version_key(company_id))
+    except Exception as e:
+        # Cached pages still expire after REVIEW_LIST_CACHE_SECONDS
+        logger.warning(f"Review list cache invalidation failed for company {company_id}: {e}")
+
+
+async def _bump_reviews_version_for_review(db: AsyncSession, performance_id: int) -> None:
+    """Goal writes change review pages that embed goals; bump the owning company's version"""
+    company_id = await db.scalar(select(Performance.company_id).where(Performance.id == performance_id))
+    if company_id is not None:
+        await _bump_reviews_version(company_id)
+
+
+def _goals_option(include_goals: bool):
+    """Eager-load goals only when asked; list pages otherwise skip the goals query entirely"""
+    return selectinload(Performance.goals) if include_goals else noload(Performance.goals)
+
+
+def _as_date(value: Any) -> Optional[date]:
+    """Coerce an ISO date string from a raw request body into a date"""
+    if isinstance(value, str):
+        return date.fromisoformat(value)
+    return value
+
 
 class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate]):
     
@@ -31,16 +69,18 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         created_by: int,
         company_id: int
     ) -> Performance:
-        """Create a new performance review"""
-        db_obj = Performance(
-            **review_data.dict(),
-            company_id=company_id,
-            created_by=created_by,
-            status=ReviewStatus.DRAFT
+        """Create a new performance review with one INSERT ... RETURNING"""
+        payload = review_data.model_dump()
+        payload.update(company_id=company_id, created_by=created_by, status=ReviewStatus.DRAFT)
+        result = await db.execute(
+            insert(Performance)
+            .values(**payload)
+            .returning(Performance)
+            .options(noload(Performance.goals))  # A new review has no goals yet
         )
-        db.add(db_obj)
+        db_obj = result.scalars().one()
         await db.commit()
-        await db.refresh(db_obj)
+        await _bump_reviews_version(company_id)
         return db_obj
     
     async def get_review_by_id(
@@ -48,12 +88,13 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         db: AsyncSession,
         *,
         review_id: int,
-        company_id: int
+        company_id: int,
+        include_goals: bool = True
     ) -> Optional[Performance]:
         """Get performance review by ID"""
         result = await db.execute(
             select(Performance)
-            .options(selectinload(Performance.goals))
+            .options(_goals_option(include_goals))
             .where(
                 and_(
                     Performance.id == review_id,
@@ -69,24 +110,28 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         *,
         employee_id: int,
         company_id: int,
+        cursor: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Performance]:
-        """Get performance reviews for an employee"""
-        result = await db.execute(
+        limit: int = 100,
+        include_goals: bool = False
+    ) -> Tuple[List[Performance], Optional[str]]:
+        """Get performance reviews for an employee, latest review period first, with keyset pagination"""
+        query = self._seek_page(
             select(Performance)
-            .options(selectinload(Performance.goals))
+            .options(_goals_option(include_goals))
             .where(
                 and_(
                     Performance.employee_id == employee_id,
                     Performance.company_id == company_id
                 )
-            )
-            .order_by(desc(Performance.review_period_start))
-            .offset(skip)
-            .limit(limit)
+            ),
+            Performance.review_period_start,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
         )
-        return result.scalars().all()
+        result = await db.execute(query)
+        return self._page_cursor(result.scalars().all(), Performance.review_period_start, limit)
     
     async def get_reviews_by_reviewer(
         self,
@@ -94,24 +139,28 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         *,
         reviewer_id: int,
         company_id: int,
+        cursor: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Performance]:
-        """Get performance reviews assigned to a reviewer"""
-        result = await db.execute(
+        limit: int = 100,
+        include_goals: bool = False
+    ) -> Tuple[List[Performance], Optional[str]]:
+        """Get performance reviews assigned to a reviewer, latest due date first, with keyset pagination"""
+        query = self._seek_page(
             select(Performance)
-            .options(selectinload(Performance.goals))
+            .options(_goals_option(include_goals))
             .where(
                 and_(
                     Performance.reviewer_id == reviewer_id,
                     Performance.company_id == company_id
                 )
-            )
-            .order_by(desc(Performance.due_date))
-            .offset(skip)
-            .limit(limit)
+            ),
+            Performance.due_date,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
         )
-        return result.scalars().all()
+        result = await db.execute(query)
+        return self._page_cursor(result.scalars().all(), Performance.due_date, limit)
     
     async def get_company_reviews(
         self,
@@ -120,23 +169,102 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         company_id: int,
         status: Optional[ReviewStatus] = None,
         review_type: Optional[PerformanceReviewType] = None,
+        cursor: Optional[str] = None,
         skip: int = 0,
-        limit: int = 100
-    ) -> List[Performance]:
-        """Get all performance reviews for a company with filters"""
-        query = select(Performance).options(selectinload(Performance.goals)).where(
-            Performance.company_id == company_id
-        )
-        
+        limit: int = 100,
+        include_goals: bool = False
+    ) -> Tuple[List[Performance], Optional[str]]:
+        """
+        Get all performance reviews for a company with filters.
+
+        Results are ordered newest first by creation time. Pass the returned
+        cursor back to fetch the next page; ``skip`` is kept for older
+        clients only.
+        """
+        filters = [Performance.company_id == company_id]
         if status:
-            query = query.where(Performance.status == status)
+            filters.append(Performance.status == status)
         if review_type:
-            query = query.where(Performance.review_type == review_type)
-            
-        query = query.order_by(desc(Performance.created_at)).offset(skip).limit(limit)
+            filters.append(Performance.review_type == review_type)
+        
+        query = self._seek_page(
+            select(Performance).options(_goals_option(include_goals)).where(*filters),
+            Performance.created_at,
+            cursor=cursor,
+            skip=skip,
+            limit=limit
+        )
         
         result = await db.execute(query)
-        return result.scalars().all()
+        return self._page_cursor(result.scalars().all(), Performance.created_at, limit)
+    
+    async def get_company_reviews_cached(
+        self,
+        db: AsyncSession,
+        *,
+        company_id: int,
+        status: Optional[ReviewStatus] = None,
+        review_type: Optional[PerformanceReviewType] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        include_goals: bool = False
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Serialized ``get_company_reviews`` pages cached in Redis for a short TTL.
+
+        The key embeds the company's review-list version, so any review write
+        invalidates all of its cached pages without deleting them one by one.
+        """
+        version = await redis_manager.get_cache(_reviews_version_key(company_id)) or 0
+        key = (
+            f"perf:reviews:{company_id}:v{version}:"
+            f"{status.value if status else ''}:{review_type.value if review_type else ''}:"
+            f"{cursor or ''}:{limit}:{int(include_goals)}"
+        )
+        cached = await redis_manager.get_cache(key)
+        if isinstance(cached, dict):
+            return cached["items"], cached["next_cursor"]
+        
+        reviews, next_cursor = await self.get_company_reviews(
+            db, company_id=company_id, status=status, review_type=review_type,
+            cursor=cursor, limit=limit, include_goals=include_goals
+        )
+        items = [PerformanceResponse.model_validate(review).model_dump(mode="json") for review in reviews]
+        await redis_manager.set_cache(
+            key, {"items": items, "next_cursor": next_cursor}, expire=REVIEW_LIST_CACHE_SECONDS
+        )
+        return items, next_cursor
+    
+    async def _update_review(
+        self,
+        db: AsyncSession,
+        *,
+        review_id: int,
+        company_id: int,
+        values: Dict[str, Any],
+        criteria: Tuple = (),
+        include_goals: bool = True
+    ) -> Optional[Performance]:
+        """
+        Apply ``values`` with one UPDATE ... RETURNING scoped to the company.
+
+        Authorization (company, plus any ``criteria`` such as the owning
+        employee) is part of the WHERE clause, so no row is read beforehand;
+        None means the review does not exist or the caller may not change it.
+        Workflow mutators pass ``include_goals=False`` since they never touch goals.
+        """
+        result = await db.execute(
+            update(Performance)
+            .where(Performance.id == review_id, Performance.company_id == company_id, *criteria)
+            .values(**values)
+            .returning(Performance)
+            .options(_goals_option(include_goals))
+        )
+        db_obj = result.scalars().first()
+        if db_obj:
+            await db.commit()
+            await _bump_reviews_version(company_id)
+        return db_obj
     
     async def update_review(
         self,
@@ -147,17 +275,13 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         company_id: int
     ) -> Optional[Performance]:
         """Update performance review"""
-        db_obj = await self.get_review_by_id(db, review_id=review_id, company_id=company_id)
-        if not db_obj:
-            return None
-            
-        update_data = review_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_obj, field, value)
+        update_data = review_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get_review_by_id(db, review_id=review_id, company_id=company_id)
         
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._update_review(
+            db, review_id=review_id, company_id=company_id, values=update_data
+        )
     
     async def submit_self_assessment(
         self,
@@ -168,26 +292,27 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         assessment_data: Dict[str, Any],
         company_id: int
     ) -> Optional[Performance]:
-        """Submit employee self-assessment"""
-        db_obj = await self.get_review_by_id(db, review_id=review_id, company_id=company_id)
-        if not db_obj or db_obj.employee_id != employee_id:
-            return None
-        
-        # Update self-assessment fields
-        db_obj.self_assessment_completed = True
-        db_obj.self_assessment_date = datetime.utcnow()
-        db_obj.self_rating = assessment_data.get('self_rating')
-        db_obj.achievements = assessment_data.get('achievements')
-        db_obj.challenges_faced = assessment_data.get('challenges_faced')
-        db_obj.employee_comments = assessment_data.get('employee_comments')
-        
-        # Update status if needed
-        if db_obj.status == ReviewStatus.DRAFT:
-            db_obj.status = ReviewStatus.MANAGER_REVIEW_PENDING
-        
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        """Submit employee self-assessment; only the reviewed employee may submit"""
+        return await self._update_review(
+            db,
+            review_id=review_id,
+            company_id=company_id,
+            criteria=(Performance.employee_id == employee_id,),
+            values={
+                'self_assessment_completed': True,
+                'self_assessment_date': func.now(),
+                'self_rating': assessment_data.get('self_rating'),
+                'achievements': assessment_data.get('achievements'),
+                'challenges_faced': assessment_data.get('challenges_faced'),
+                'employee_comments': assessment_data.get('employee_comments'),
+                # Move drafts on to the manager; later stages keep their status
+                'status': case(
+                    (Performance.status == ReviewStatus.DRAFT, ReviewStatus.MANAGER_REVIEW_PENDING),
+                    else_=Performance.status
+                ),
+            },
+            include_goals=False
+        )
     
     async def submit_manager_review(
         self,
@@ -198,36 +323,32 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         review_data: Dict[str, Any],
         company_id: int
     ) -> Optional[Performance]:
-        """Submit manager review"""
-        db_obj = await self.get_review_by_id(db, review_id=review_id, company_id=company_id)
-        if not db_obj or db_obj.reviewer_id != reviewer_id:
-            return None
-        
-        # Update manager review fields
-        db_obj.manager_review_completed = True
-        db_obj.manager_review_date = datetime.utcnow()
-        db_obj.recommended_rating = review_data.get('recommended_rating')
-        db_obj.promotion_recommendation = review_data.get('promotion_recommendation', False)
-        db_obj.salary_increase_recommendation = review_data.get('salary_increase_recommendation')
-        db_obj.manager_comments = review_data.get('manager_comments')
-        db_obj.strengths = review_data.get('strengths')
-        db_obj.areas_for_improvement = review_data.get('areas_for_improvement')
-        db_obj.development_plan = review_data.get('development_plan')
-        
-        # Update ratings
-        db_obj.overall_rating = review_data.get('overall_rating')
-        db_obj.technical_skills_rating = review_data.get('technical_skills_rating')
-        db_obj.communication_rating = review_data.get('communication_rating')
-        db_obj.teamwork_rating = review_data.get('teamwork_rating')
-        db_obj.leadership_rating = review_data.get('leadership_rating')
-        db_obj.initiative_rating = review_data.get('initiative_rating')
-        
-        # Update status
-        db_obj.status = ReviewStatus.HR_REVIEW_PENDING
-        
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        """Submit manager review; only the assigned reviewer may submit"""
+        return await self._update_review(
+            db,
+            review_id=review_id,
+            company_id=company_id,
+            criteria=(Performance.reviewer_id == reviewer_id,),
+            values={
+                'manager_review_completed': True,
+                'manager_review_date': func.now(),
+                'recommended_rating': review_data.get('recommended_rating'),
+                'promotion_recommendation': review_data.get('promotion_recommendation', False),
+                'salary_increase_recommendation': review_data.get('salary_increase_recommendation'),
+                'manager_comments': review_data.get('manager_comments'),
+                'strengths': review_data.get('strengths'),
+                'areas_for_improvement': review_data.get('areas_for_improvement'),
+                'development_plan': review_data.get('development_plan'),
+                'overall_rating': review_data.get('overall_rating'),
+                'technical_skills_rating': review_data.get('technical_skills_rating'),
+                'communication_rating': review_data.get('communication_rating'),
+                'teamwork_rating': review_data.get('teamwork_rating'),
+                'leadership_rating': review_data.get('leadership_rating'),
+                'initiative_rating': review_data.get('initiative_rating'),
+                'status': ReviewStatus.HR_REVIEW_PENDING,
+            },
+            include_goals=False
+        )
     
     async def finalize_review(
         self,
@@ -239,25 +360,22 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         company_id: int
     ) -> Optional[Performance]:
         """Finalize performance review"""
-        db_obj = await self.get_review_by_id(db, review_id=review_id, company_id=company_id)
-        if not db_obj:
-            return None
-        
-        # Update final review fields
-        db_obj.final_review_completed = True
-        db_obj.final_review_date = datetime.utcnow()
-        db_obj.final_reviewed_by = hr_user_id
-        db_obj.hr_comments = final_data.get('hr_comments')
-        db_obj.status = ReviewStatus.COMPLETED
-        db_obj.completion_percentage = 100
-        
+        values = {
+            'final_review_completed': True,
+            'final_review_date': func.now(),
+            'final_reviewed_by': hr_user_id,
+            'hr_comments': final_data.get('hr_comments'),
+            'status': ReviewStatus.COMPLETED,
+            'completion_percentage': 100,
+        }
         # Override ratings if provided
         if 'final_overall_rating' in final_data:
-            db_obj.overall_rating = final_data['final_overall_rating']
+            values['overall_rating'] = final_data['final_overall_rating']
         
-        await db.commit()
-        await db.refresh(db_obj)
-        return db_obj
+        return await self._update_review(
+            db, review_id=review_id, company_id=company_id, values=values,
+            include_goals=False
+        )
     
     async def get_performance_analytics(
         self,
@@ -268,42 +386,52 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         end_date: Optional[date] = None,
         department_id: Optional[int] = None
     ) -> Dict[str, Any]:
-        """Get performance analytics and summary"""
-        query = select(Performance).where(Performance.company_id == company_id)
-        
+        """
+        Get performance analytics and summary.
+
+        Reads the per-cycle aggregates in ``mv_performance_analytics`` rather
+        than scanning reviews, so figures can lag writes by up to one refresh
+        interval (every 5 minutes, see app.tasks.performance).
+        """
+        mv = performance_analytics_view.c
+        filters = [mv.company_id == company_id]
         if start_date:
-            query = query.where(Performance.review_period_start >= start_date)
+            filters.append(mv.review_period_start >= start_date)
         if end_date:
-            query = query.where(Performance.review_period_end <= end_date)
-        
-        result = await db.execute(query)
-        reviews = result.scalars().all()
+            filters.append(mv.review_period_end <= end_date)
         
-        # Calculate analytics
-        total_reviews = len(reviews)
-        completed_reviews = len([r for r in reviews if r.status == ReviewStatus.COMPLETED])
-        avg_rating = sum([r.overall_rating for r in reviews if r.overall_rating]) / len([r for r in reviews if r.overall_rating]) if reviews else 0
+        def total(column):
+            return func.coalesce(func.sum(column), 0)
         
-        # Status distribution
-        status_counts = {}
-        for status in ReviewStatus:
-            status_counts[status.value] = len([r for r in reviews if r.status == status])
+        # Roll the matching cycles up into totals, status histogram and rating buckets
+        result = await db.execute(
+            select(
+                total(mv.total).label("total"),
+                (func.sum(mv.rating_sum) / func.nullif(func.sum(mv.rated), 0)).label("average_rating"),
+                total(mv.excellent).label("excellent"),
+                total(mv.good).label("good"),
+                total(mv.average).label("average"),
+                total(mv.below_average).label("below_average"),
+                *[total(mv[status.name.lower()]).label(status.name) for status in ReviewStatus]
+            ).where(*filters)
+        )
+        stats = result.mappings().one()
         
-        # Rating distribution
-        rating_ranges = {
-            "excellent": len([r for r in reviews if r.overall_rating and r.overall_rating >= 4.5]),
-            "good": len([r for r in reviews if r.overall_rating and 3.5 <= r.overall_rating < 4.5]),
-            "average": len([r for r in reviews if r.overall_rating and 2.5 <= r.overall_rating < 3.5]),
-            "below_average": len([r for r in reviews if r.overall_rating and r.overall_rating < 2.5])
-        }
+        total_reviews = int(stats["total"])
+        completed_reviews = int(stats[ReviewStatus.COMPLETED.name])
         
         return {
             "total_reviews": total_reviews,
             "completed_reviews": completed_reviews,
             "completion_rate": (completed_reviews / total_reviews * 100) if total_reviews > 0 else 0,
-            "average_rating": round(avg_rating, 2),
-            "status_distribution": status_counts,
-            "rating_distribution": rating_ranges
+            "average_rating": round(float(stats["average_rating"] or 0), 2),
+            "status_distribution": {status.value: int(stats[status.name]) for status in ReviewStatus},
+            "rating_distribution": {
+                "excellent": int(stats["excellent"]),
+                "good": int(stats["good"]),
+                "average": int(stats["average"]),
+                "below_average": int(stats["below_average"])
+            }
         }
     
     async def bulk_create_reviews(
@@ -313,29 +441,120 @@ class CRUDPerformance(CRUDBase[Performance, PerformanceCreate, PerformanceUpdate
         review_data: Dict[str, Any],
         created_by: int,
         company_id: int
-    ) -> List[Performance]:
-        """Bulk create performance reviews"""
+    ) -> List[int]:
+        """
+        Bulk create performance reviews with a single INSERT ... SELECT.
+
+        The cohort is expanded in the database from ``employee_ids`` and/or
+        ``department_id``; with neither, nothing is created. When the template
+        has no ``reviewer_id`` each employee's manager is used, and a
+        ValueError is raised if any employee in the cohort has no manager.
+        Returns the IDs of the created reviews.
+        """
         employee_ids = review_data.get('employee_ids', [])
+        department_id = review_data.get('department_id')
         review_template = review_data.get('review_template', {})
+        reviewer_id = review_template.get('reviewer_id')
         
-        created_reviews = []
-        for employee_id in employee_ids:
-            review = Performance(
-                company_id=company_id,
-                employee_id=employee_id,
-                reviewer_id=review_template.get('reviewer_id'),
-                review_type=PerformanceReviewType(review_template.get('review_type')),
-                review_period_start=review_template.get('review_period_start'),
-                review_period_end=review_template.get('review_period_end'),
-                due_date=review_template.get('due_date'),
-                created_by=created_by,
-                status=ReviewStatus.DRAFT
+        if not employee_ids and not department_id:
+            return []
+        
+        cohort_filter = [Employee.company_id == company_id]
+        if employee_ids:
+            cohort_filter.append(Employee.id.in_(employee_ids))
+        if department_id:
+            cohort_filter.append(Employee.department_id == department_id)
+        
+        if not reviewer_id:
+            # reviewer_id is NOT NULL: refuse rather than skip employees without a manager
+            result = await db.execute(
+                select(Employee.id).where(*cohort_filter, Employee.manager_id.is_(None))
             )
-            db.add(review)
-            created_reviews.append(review)
+            unassigned = result.scalars().all()
+            if unassigned:
+                raise ValueError(
+                    f"No reviewer_id given and employees {sorted(unassigned)} have no manager"
+                )
         
+        cohort = select(
+            Employee.id,
+            literal(reviewer_id, Integer) if reviewer_id else Employee.manager_id,
+            literal(company_id, Integer),
+            literal(PerformanceReviewType(review_template.get('review_type')), Performance.review_type.type),
+            literal(_as_date(review_template.get('review_period_start')), Date),
+            literal(_as_date(review_template.get('review_period_end')), Date),
+            literal(_as_date(review_template.get('due_date')), Date),
+            literal(ReviewStatus.DRAFT, Performance.status.type),
+            literal(created_by, Integer),
+        ).where(*cohort_filter)
+        
+        stmt = insert(Performance).from_select(
+            [
+                'employee_id', 'reviewer_id', 'company_id', 'review_type',
+                'review_period_start', 'review_period_end', 'due_date',
+                'status', 'created_by'
+            ],
+            cohort
+        ).returning(Performance.id)
+        
+        result = await db.execute(stmt)
+        review_ids = result.scalars().all()
         await db.commit()
-        return created_reviews
+        await _bump_reviews_version(company_id)
+        return review_ids
+
+    async def get_reminder_recipients(
+        self,
+        db: AsyncSession,
+        *,
+        employee_ids: List[int],
+        company_id: int
+    ) -> List[str]:
+        """Resolve employee IDs with an open review to work email addresses in one query"""
+        if not employee_ids:
+            return []
+        has_open_review = select(Performance.id).where(
+            and_(
+                Performance.employee_id == Employee.id,
+                Performance.company_id == company_id,
+                Performance.status.notin_([ReviewStatus.COMPLETED, ReviewStatus.CANCELLED])
+            )
+        ).exists()
+        result = await db.execute(
+            select(Employee.work_email).where(
+                and_(
+                    Employee.id.in_(employee_ids),
+                    Employee.company_id == company_id,
+                    Employee.work_email.isnot(None),
+                    has_open_review
+                )
+            )
+        )
+        return result.scalars().all()
+
+    async def get_reviews_by_ids(
+        self,
+        db: AsyncSession,
+        *,
+        review_ids: List[int],
+        company_id: int,
+        include_goals: bool = True
+    ) -> List[Performance]:
+        """Get performance reviews by a list of IDs"""
+        if not review_ids:
+            return []
+        result = await db.execute(
+            select(Performance)
+            .options(_goals_option(include_goals))
+            .where(
+                and_(
+                    Performance.id.in_(review_ids),
+                    Performance.company_id == company_id
+                )
+            )
+            .order_by(Performance.id)
+        )
+        return result.scalars().all()
 
 
 class CRUDPerformanceGoal(CRUDBase[PerformanceGoal, PerformanceGoalCreate, PerformanceGoalUpdate]):
@@ -346,11 +565,13 @@ class CRUDPerformanceGoal(CRUDBase[PerformanceGoal, PerformanceGoalCreate, Perfo
         *,
         goal_data: PerformanceGoalCreate
     ) -> PerformanceGoal:
-        """Create a new performance goal"""
-        db_obj = PerformanceGoal(**goal_data.dict())
-        db.add(db_obj)
+        """Create a new performance goal with one INSERT ... RETURNING"""
+        result = await db.execute(
+            insert(PerformanceGoal).values(**goal_data.model_dump()).returning(PerformanceGoal)
+        )
+        db_obj = result.scalars().one()
         await db.commit()
-        await db.refresh(db_obj)
+        await _bump_reviews_version_for_review(db, db_obj.performance_id)
         return db_obj
     
     async def get_goals_by_performance(
@@ -358,16 +579,35 @@ class CRUDPerformanceGoal(CRUDBase[PerformanceGoal, PerformanceGoalCreate, Perfo
         db: AsyncSession,
         *,
         performance_id: int,
-        status: Optional[GoalStatus] = None
-    ) -> List[PerformanceGoal]:
-        """Get goals for a performance review"""
+        status: Optional[GoalStatus] = None,
+        after_id: Optional[int] = None,
+        skip: int = 0,
+        limit: int = 100
+    ) -> Tuple[List[PerformanceGoal], Optional[str]]:
+        """
+        Get goals for a performance review, seeking past ``after_id``.
+
+        ``skip`` is only honoured when no ``after_id`` cursor is given. One
+        extra row is fetched so the next cursor is only returned when another
+        page exists.
+        """
         query = select(PerformanceGoal).where(PerformanceGoal.performance_id == performance_id)
         
         if status:
             query = query.where(PerformanceGoal.status == status)
+        if after_id is not None:
+            query = query.where(PerformanceGoal.id > after_id)
+        elif skip:
+            query = query.offset(skip)
         
+        query = query.order_by(PerformanceGoal.id).limit(limit + 1)
         result = await db.execute(query)
-        return result.scalars().all()
+        goals = result.scalars().all()
+        if len(goals) <= limit:
+            return goals, None
+        goals = goals[:limit]
+        # Goals page ascending by ID, so the last goal ID is the cursor
+        return goals, str(goals[-1].id)
     
     async def update_goal(
         self,
@@ -383,12 +623,13 @@ class CRUDPerformanceGoal(CRUDBase[PerformanceGoal, PerformanceGoalCreate, Perfo
         if not db_obj:
             return None
         
-        update_data = goal_update.dict(exclude_unset=True)
+        update_data = goal_update.model_dump(exclude_unset=True)
         for field, value in update_data.items():
             setattr(db_obj, field, value)
         
         await db.commit()
         await db.refresh(db_obj)
+        await _bump_reviews_version_for_review(db, db_obj.performance_id)
         return db_obj
     
     async def update_goal_progress(
@@ -419,7 +660,15 @@ class CRUDPerformanceGoal(CRUDBase[PerformanceGoal, PerformanceGoalCreate, Perfo
         
         await db.commit()
         await db.refresh(db_obj)
+        await _bump_reviews_version_for_review(db, db_obj.performance_id)
         return db_obj
+    
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[PerformanceGoal]:
+        """Delete a goal and invalidate the cached review pages that embed it"""
+        goal = await super().remove(db, id=id)
+        if goal:
+            await _bump_reviews_version_for_review(db, goal.performance_id)
+        return goal
 
 
 class CRUDPerformanceTemplate(CRUDBase[PerformanceTemplate, PerformanceTemplateCreate, PerformanceTemplateCreate]):
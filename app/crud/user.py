@@ -1,32 +1,69 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from app.crud.base import CRUDBase
-from app.models.user import User
+from sqlalchemy import select, update, and_, case, func, lambda_stmt, DateTime, Enum
+from app.crud.base import CRUDBase, update_returning
+from app.core.request_cache import invalidate_request_cache
+from app.models.user import User, UserStatus
 from app.models.employee import Employee
 from app.schemas.auth import UserRegister
-from app.core.security import verify_password, get_password_hash
-from typing import Optional, List
-from datetime import datetime
+from app.core.redis import redis_manager
+from app.core.security import (
+    averify_password, averify_dummy_password, aget_password_hash,
+    user_cache_key, USER_CACHE_SECONDS
+)
+from typing import Any, Dict, Optional, List
+from datetime import datetime, timedelta, timezone
+
+# Lock an account for LOCKOUT_MINUTES after MAX_FAILED_LOGINS consecutive failures
+MAX_FAILED_LOGINS = 5
+LOCKOUT_MINUTES = 30
+
+# Credentials and one-time tokens never go into the shared user cache
+_UNCACHED_USER_COLUMNS = frozenset({
+    "hashed_password", "password_reset_token", "password_reset_expires",
+    "email_verification_token", "two_factor_secret",
+})
+_CACHED_USER_COLUMNS = [
+    column for column in User.__table__.columns if column.key not in _UNCACHED_USER_COLUMNS
+]
+
+
+def _user_to_cache(user: User) -> Dict[str, Any]:
+    return {column.key: getattr(user, column.key) for column in _CACHED_USER_COLUMNS}
+
+
+def _user_from_cache(data: Dict[str, Any]) -> User:
+    """Rebuild a detached, read-only User from its cached row"""
+    values = {}
+    for column in _CACHED_USER_COLUMNS:
+        value = data.get(column.key)
+        if value is not None:
+            if isinstance(column.type, DateTime):
+                value = datetime.fromisoformat(value)
+            elif isinstance(column.type, Enum) and column.type.enum_class:
+                value = column.type.enum_class(value)
+        values[column.key] = value
+    return User(**values)
 
 
 class CRUDUser(CRUDBase[User, UserRegister, dict]):
     
     async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
-        """Get user by email"""
-        result = await db.execute(select(User).where(User.email == email))
-        return result.scalars().first()
+        """Get user by email; emails are stored lowercased, so this uses the unique email index"""
+        email = email.lower()
+        result = await db.execute(lambda_stmt(lambda: select(User).where(User.email == email)))
+        return result.scalar_one_or_none()
     
     async def get_by_username(self, db: AsyncSession, *, username: str) -> Optional[User]:
         """Get user by username"""
-        result = await db.execute(select(User).where(User.username == username))
-        return result.scalars().first()
+        result = await db.execute(lambda_stmt(lambda: select(User).where(User.username == username)))
+        return result.scalar_one_or_none()
     
     async def create(self, db: AsyncSession, *, obj_in: UserRegister) -> User:
         """Create new user with hashed password"""
         db_obj = User(
-            email=obj_in.email,
+            email=obj_in.email.lower(),
             username=obj_in.username,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await aget_password_hash(obj_in.password),
             first_name=obj_in.first_name,
             last_name=obj_in.last_name,
             phone=obj_in.phone,
@@ -39,34 +76,89 @@ class CRUDUser(CRUDBase[User, UserRegister, dict]):
     async def authenticate(
         self, db: AsyncSession, *, email: str, password: str
     ) -> Optional[User]:
-        """Authenticate user with email and password"""
+        """
+        Authenticate user with email and password.
+
+        Locked and inactive accounts are turned away before bcrypt runs, so
+        repeated attempts against them cost no hashing. The trade-off is timing:
+        such accounts answer faster than a wrong password, which reveals that
+        the address is registered but unusable. Unknown emails still pay a dummy
+        bcrypt verify so that registered, usable addresses can't be enumerated
+        by response time.
+        """
         user = await self.get_by_email(db, email=email)
         if not user:
+            await averify_dummy_password(password)
+            return None
+        if user.status != UserStatus.ACTIVE:
             return None
-        if not verify_password(password, user.hashed_password):
+        if user.locked_until and user.locked_until > datetime.now(timezone.utc):
+            return None
+        if not await averify_password(password, user.hashed_password):
             return None
         return user
     
-    async def update_last_login(self, db: AsyncSession, *, user_id: int) -> User:
-        """Update user's last login timestamp"""
-        user = await self.get(db, id=user_id)
-        if user:
-            user.last_login = datetime.utcnow()
-            user.failed_login_attempts = 0  # Reset failed attempts on successful login
-            await db.commit()
-            await db.refresh(user)
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Dict[str, Any]
+    ) -> User:
+        """Update a user and drop its cached auth row"""
+        if obj_in.get("email"):
+            obj_in = {**obj_in, "email": obj_in["email"].lower()}
+        user = await super().update(db, db_obj=db_obj, obj_in=obj_in)
+        await self.evict_cached(user.id)
+        return user
+    
+    async def remove(self, db: AsyncSession, *, id: int) -> Optional[User]:
+        """Delete a user and drop its cached auth row"""
+        user = await super().remove(db, id=id)
+        await self.evict_cached(id)
+        return user
+    
+    async def update_last_login(self, db: AsyncSession, *, user_id: int) -> Optional[User]:
+        """Update user's last login timestamp and reset failed attempts in one UPDATE"""
+        user = await update_returning(
+            db, User, user_id, {"last_login": func.now(), "failed_login_attempts": 0}
+        )
+        await self.evict_cached(user_id)
         return user
     
     async def increment_failed_login(self, db: AsyncSession, *, email: str) -> Optional[User]:
-        """Increment failed login attempts"""
-        user = await self.get_by_email(db, email=email)
+        """Atomically increment failed login attempts, locking the account at the threshold"""
+        attempts = func.coalesce(User.failed_login_attempts, 0) + 1
+        result = await db.execute(
+            update(User)
+            .where(User.email == email.lower())
+            .values(
+                failed_login_attempts=attempts,
+                locked_until=case(
+                    (attempts >= MAX_FAILED_LOGINS, func.now() + timedelta(minutes=LOCKOUT_MINUTES)),
+                    else_=User.locked_until
+                )
+            )
+            .returning(User)
+        )
+        user = result.scalars().first()
         if user:
-            user.failed_login_attempts += 1
-            # Lock account after 5 failed attempts
-            if user.failed_login_attempts >= 5:
-                user.locked_until = datetime.utcnow() + timedelta(minutes=30)
             await db.commit()
-            await db.refresh(user)
+            invalidate_request_cache(User)
+            await self.evict_cached(user.id)
+        return user
+    
+    async def evict_cached(self, user_id: int) -> None:
+        """Forget a user's cached auth row after it changes"""
+        await redis_manager.delete_cache(user_cache_key(user_id))
+    
+    async def get_cached(
+        self, db: AsyncSession, *, user_id: int, cached: Optional[Dict[str, Any]] = None
+    ) -> Optional[User]:
+        """User for the auth path: rebuilt from a cached row when given, else loaded and cached"""
+        if cached:
+            return _user_from_cache(cached)
+        user = await self.get(db, id=user_id)
+        if user:
+            await redis_manager.set_cache(
+                user_cache_key(user_id), _user_to_cache(user), expire=USER_CACHE_SECONDS
+            )
         return user
     
     async def is_active(self, user: User) -> bool:
@@ -82,7 +174,7 @@ class CRUDEmployee(CRUDBase[Employee, dict, dict]):
     
     async def get_by_user_id(self, db: AsyncSession, *, user_id: int) -> Optional[Employee]:
         """Get employee by user ID"""
-        result = await db.execute(select(Employee).where(Employee.user_id == user_id))
+        result = await db.execute(lambda_stmt(lambda: select(Employee).where(Employee.user_id == user_id)))
         return result.scalars().first()
     
     async def get_by_employee_id(
@@ -6,7 +6,7 @@ High-performance FastAPI application for comprehensive HR management
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -14,14 +14,16 @@ import time
 import logging
 import uvicorn
 import structlog
+from sqlalchemy import text
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import engine, init_db
 from app.core.redis import redis_manager
+from app.core.security import revocation_listener
 from app.api.v1.api import api_router
 from app.middleware.auth import AuthMiddleware
-from app.middleware.tenant import TenantMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.request_cache import RequestCacheMiddleware
 
 # Configure structured logging
 structlog.configure(
@@ -48,6 +50,7 @@ limiter = Limiter(key_func=get_remote_address)
 
 # Create FastAPI application
 app = FastAPI(
+    default_response_class=ORJSONResponse,
     title=settings.PROJECT_NAME,
     description="""
     ## HRMS SaaS Platform
@@ -108,10 +111,11 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # Add middleware
-app.add_middleware(GZipMiddleware, minimum_size=1000)
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(TenantMiddleware)
+# Starlette runs the last middleware added outermost, so requests pass through
+# GZip (optional) -> CORS -> Logging -> Auth (+ tenant) -> RequestCache -> route
+app.add_middleware(RequestCacheMiddleware)
 app.add_middleware(AuthMiddleware)
+app.add_middleware(LoggingMiddleware)
 
 # CORS middleware
 app.add_middleware(
@@ -122,6 +126,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compression is done by the reverse proxy (see nginx.conf); opt in only when serving directly
+if settings.ENABLE_GZIP:
+    app.add_middleware(GZipMiddleware, minimum_size=2000)
+
 # Global exception handler
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
@@ -148,15 +156,32 @@ async def global_exception_handler(request: Request, exc: Exception):
     )
 
 # Health check endpoint
+# Last Redis ping as (monotonic time, result); probes within the window reuse it
+REDIS_PING_CACHE_SECONDS = 1.0
+_redis_ping_cache = (float("-inf"), False)
+
+
+async def _cached_redis_ping() -> bool:
+    """Ping Redis at most once per REDIS_PING_CACHE_SECONDS"""
+    global _redis_ping_cache
+    checked_at, status = _redis_ping_cache
+    now = time.monotonic()
+    if now - checked_at >= REDIS_PING_CACHE_SECONDS:
+        status = await redis_manager.ping()
+        _redis_ping_cache = (now, status)
+    return status
+
+
 @app.get("/health", tags=["System"])
 async def health_check():
     """System health check endpoint"""
     try:
-        # Check database connection
-        await init_db()
+        # Check database connection with a pooled SELECT 1
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         
         # Check Redis connection
-        redis_status = await redis_manager.ping()
+        redis_status = await _cached_redis_ping()
         
         return {
             "status": "healthy",
@@ -194,6 +219,9 @@ async def startup_event():
         await redis_manager.init_redis()
         logger.info("Redis connection established")
         
+        # Receive token revocations made on other workers
+        await revocation_listener.start()
+        
         logger.info("HRMS SaaS Platform started successfully!")
         
     except Exception as e:
@@ -207,6 +235,8 @@ async def shutdown_event():
     logger.info("Shutting down HRMS SaaS Platform...")
     
     try:
+        await revocation_listener.stop()
+        
         # Close Redis connections
         await redis_manager.close()
         logger.info("Redis connections closed")
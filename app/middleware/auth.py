@@ -1,138 +1,141 @@
-from fastapi import Request, HTTPException, status, Depends
-from fastapi.responses import JSONResponse
-from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from starlette.middleware.base import BaseHTTPMiddleware
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.core.security import verify_token
-from app.core.redis import redis_manager
-from app.core.database import get_db
-from app.crud.user import user_crud
-from app.models.user import User
+from starlette import status
+from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Optional, Tuple
+from app.core.security import verify_token, is_token_revoked
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 
-# FastAPI security scheme
-security = HTTPBearer()
+# Routes that don't require authentication: exact paths, plus path prefixes
+# checked with one C-level str.startswith(tuple) call
+EXEMPT_PATHS = frozenset({
+    "/health",
+    "/health/ready",
+    "/api/v1/auth/login",
+    "/api/v1/auth/register",
+    "/api/v1/auth/refresh",
+    "/api/docs",
+    "/api/redoc",
+    "/api/openapi.json",
+    "/docs",
+    "/redoc",
+    "/openapi.json"
+})
+EXEMPT_PREFIXES = (
+    "/api/docs/",
+    "/docs/",  # Swagger UI's oauth2-redirect lives here
+)
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: AsyncSession = Depends(get_db)
-) -> User:
+# Rejection bodies are encoded once at import; auth failures only copy bytes
+_HEADER_MISSING = orjson.dumps({"detail": "Authorization header missing"})
+_INVALID_FORMAT = orjson.dumps({"detail": "Invalid authorization format"})
+_INVALID_TOKEN = orjson.dumps({"detail": "Invalid or expired token"})
+_TOKEN_REVOKED = orjson.dumps({"detail": "Token has been revoked"})
+_AUTH_ERROR = orjson.dumps({"detail": "Authentication error"})
+
+
+def _json_error(status_code: int, body: bytes) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+class AuthMiddleware:
     """
-    Dependency to get current authenticated user.
+    Resolve the tenant context and authenticate protected routes in one pass.
+
+    Plain ASGI middleware rather than BaseHTTPMiddleware, so requests are not
+    wrapped in an extra task and response stream by call_next.
     """
-    token = credentials.credentials
-    
-    # Check if token is blacklisted
-    is_blacklisted = await redis_manager.get_cache(f"blacklist:{token}")
-    if is_blacklisted:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Token has been revoked"
-        )
-    
-    # Verify token
-    payload = verify_token(token)
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid or expired token"
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload"
-        )
     
-    # Get user from database
-    user = await user_crud.get(db, id=int(user_id))
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found"
-        )
+    def __init__(self, app: ASGIApp):
+        self.app = app
     
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User account is disabled"
-        )
+    @staticmethod
+    def is_exempt(path: str) -> bool:
+        return path in EXEMPT_PATHS or path.startswith(EXEMPT_PREFIXES)
     
-    return user
+    @staticmethod
+    def _read_headers(scope: Scope) -> Tuple[Optional[bytes], Optional[bytes]]:
+        """
+        Authorization and X-Company-ID values straight from the raw ASGI headers.
 
-
-class AuthMiddleware(BaseHTTPMiddleware):
-    """Authentication middleware for protected routes"""
+        One scan over the (name, value) byte pairs; ASGI servers lowercase
+        header names, and nothing else is decoded to str.
+        """
+        authorization = company = None
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                authorization = value
+            elif name == b"x-company-id":
+                company = value
+        return authorization, company
     
-    # Routes that don't require authentication
-    EXEMPT_PATHS = [
-        "/health",
-        "/health/ready",
-        "/api/v1/auth/login",
-        "/api/v1/auth/register",
-        "/api/v1/auth/refresh",
-        "/api/docs",
-        "/api/redoc",
-        "/api/openapi.json",
-        "/docs",
-        "/redoc",
-        "/openapi.json"
-    ]
+    @staticmethod
+    def _company_id(raw: Optional[bytes]) -> Optional[int]:
+        """Company context from the X-Company-ID header, if present and numeric"""
+        if raw:
+            try:
+                return int(raw)
+            except ValueError:
+                pass
+        return None
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip authentication for exempt paths
-        if request.url.path in self.EXEMPT_PATHS:
-            return await call_next(request)
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # CORS preflight and exempt routes go straight through, before any
+        # header scanning or state writes; plain str reads from the scope
+        method = scope["method"]
+        path = scope["path"]
+        if method == "OPTIONS" or self.is_exempt(path):
+            await self.app(scope, receive, send)
+            return
+        
+        # Request.state is backed by scope["state"], so downstream handlers
+        # see these values without building a Request here
+        state = scope.setdefault("state", {})
+        authorization, company = self._read_headers(scope)
+        
+        # Add company context to request state (formerly TenantMiddleware)
+        state["company_id"] = self._company_id(company)
         
-        # Skip authentication for OPTIONS requests (CORS preflight)
-        if request.method == "OPTIONS":
-            return await call_next(request)
+        rejection = await self._authenticate(state, authorization)
+        if rejection is not None:
+            await rejection(scope, receive, send)
+            return
         
+        await self.app(scope, receive, send)
+    
+    async def _authenticate(self, state: dict, authorization: Optional[bytes]) -> Optional[Response]:
+        """Populate request state from the bearer token; returns an error response on failure"""
         try:
-            # Extract token from Authorization header
-            authorization = request.headers.get("Authorization")
             if not authorization:
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Authorization header missing"}
-                )
-            
-            if not authorization.startswith("Bearer "):
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Invalid authorization format"}
-                )
+                return _json_error(status.HTTP_401_UNAUTHORIZED, _HEADER_MISSING)
             
-            token = authorization.split(" ")[1]
+            # Bytes prefix compare + slice; only the token itself is decoded
+            if len(authorization) < 8 or not authorization.startswith(b"Bearer "):
+                return _json_error(status.HTTP_401_UNAUTHORIZED, _INVALID_FORMAT)
             
-            # Check if token is blacklisted
-            is_blacklisted = await redis_manager.get_cache(f"blacklist:{token}")
-            if is_blacklisted:
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Token has been revoked"}
-                )
+            token = authorization[7:].decode("latin-1")
             
             # Verify token
             payload = verify_token(token)
             if not payload:
-                return JSONResponse(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    content={"detail": "Invalid or expired token"}
-                )
+                return _json_error(status.HTTP_401_UNAUTHORIZED, _INVALID_TOKEN)
             
-            # Add user info to request state
-            request.state.user_id = payload.get("sub")
-            request.state.token = token
+            # Check if token is blacklisted (keyed by its jti claim)
+            if await is_token_revoked(payload):
+                return _json_error(status.HTTP_401_UNAUTHORIZED, _TOKEN_REVOKED)
             
-            return await call_next(request)
+            # Add user info to request state
+            state["user_id"] = payload.get("sub")
+            state["token"] = token
+            state["jwt_payload"] = payload
+            return None
             
         except Exception as e:
             logger.error(f"Authentication middleware error: {e}")
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"detail": "Authentication error"}
-            )
+            return _json_error(status.HTTP_500_INTERNAL_SERVER_ERROR, _AUTH_ERROR)
@@ -10,7 +10,13 @@ logger = logging.getLogger(__name__)
 class LoggingMiddleware(BaseHTTPMiddleware):
     """Middleware for request/response logging and metrics"""
     
+    # Probe endpoints hit every few seconds; not worth a log line or a request ID
+    SKIP_PATHS = {"/health", "/health/ready", "/metrics"}
+    
     async def dispatch(self, request: Request, call_next):
+        if request.url.path in self.SKIP_PATHS:
+            return await call_next(request)
+        
         # Generate request ID
         request_id = str(uuid.uuid4())
         request.state.request_id = request_id
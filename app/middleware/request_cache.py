@@ -0,0 +1,22 @@
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.request_cache import start_request_cache, end_request_cache
+
+
+class RequestCacheMiddleware:
+    """Give every request its own lookup cache, discarded when the response is sent"""
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        # Plain ASGI: the app runs in this task, so it sees the ContextVar directly
+        token = start_request_cache()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_request_cache(token)
@@ -44,7 +44,7 @@ class Asset(Base):
     company_id = Column(Integer, ForeignKey("companies.id"), nullable=False)
     
     # Asset identification
-    asset_tag = Column(String(100), nullable=False, unique=True)
+    asset_tag = Column(String(100), nullable=False)  # unique per company via idx_asset_company_tag
     serial_number = Column(String(100))
     asset_type = Column(Enum(AssetType), nullable=False)
     brand = Column(String(100))
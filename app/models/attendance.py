@@ -1,8 +1,12 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Index, Date, Time
+from sqlalchemy import Column, Integer, SmallInteger, String, DateTime, Boolean, ForeignKey, Enum, Index, Date, Time, Float, text
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.types import Numeric
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
+from datetime import date
 import enum
 
 
@@ -23,6 +27,27 @@ class PunchType(str, enum.Enum):
     BREAK_END = "break_end"
 
 
+# Bits of Attendance.flags; room for 12 more before SMALLINT runs out
+FLAG_LATE = 1
+FLAG_EARLY_DEPARTURE = 2
+FLAG_REQUIRES_APPROVAL = 4
+
+
+def _flag_property(bit: int) -> hybrid_property:
+    """Boolean view of one Attendance.flags bit, usable on instances and in queries"""
+    def fget(self) -> bool:
+        return bool((self.flags or 0) & bit)
+    
+    def fset(self, value: bool) -> None:
+        flags = self.flags or 0
+        self.flags = flags | bit if value else flags & ~bit
+    
+    def expr(cls):
+        return cls.flags.op("&")(bit) != 0
+    
+    return hybrid_property(fget, fset, expr=expr)
+
+
 class Attendance(Base):
     __tablename__ = "attendances"
     
@@ -38,19 +63,19 @@ class Attendance(Base):
     total_hours = Column(Numeric(5, 2))
     overtime_hours = Column(Numeric(5, 2), default=0)
     
-    # Location tracking
-    punch_in_latitude = Column(Numeric(10, 8))
-    punch_in_longitude = Column(Numeric(11, 8))
-    punch_out_latitude = Column(Numeric(10, 8))
-    punch_out_longitude = Column(Numeric(11, 8))
+    # Location tracking (float8: fixed 8 bytes, read back as Python floats)
+    punch_in_latitude = Column(Float(precision=53))
+    punch_in_longitude = Column(Float(precision=53))
+    punch_out_latitude = Column(Float(precision=53))
+    punch_out_longitude = Column(Float(precision=53))
     punch_in_address = Column(String(500))
     punch_out_address = Column(String(500))
     
     # Status and validation
     status = Column(Enum(AttendanceStatus), default=AttendanceStatus.PRESENT)
-    is_late = Column(Boolean, default=False)
+    # Late / early departure / approval booleans packed into one column (FLAG_* bits)
+    flags = Column(SmallInteger, nullable=False, default=0, server_default="0")
     late_minutes = Column(Integer, default=0)
-    early_departure = Column(Boolean, default=False)
     early_departure_minutes = Column(Integer, default=0)
     
     # Manual adjustments
@@ -61,14 +86,17 @@ class Attendance(Base):
     adjustment_date = Column(DateTime(timezone=True))
     
     # Approval workflow
-    requires_approval = Column(Boolean, default=False)
     approved_by = Column(Integer, ForeignKey("users.id"))
     approved_at = Column(DateTime(timezone=True))
     approval_comments = Column(String(500))
     
     # System fields
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.statement_timestamp())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.statement_timestamp())
+    
+    is_late = _flag_property(FLAG_LATE)
+    early_departure = _flag_property(FLAG_EARLY_DEPARTURE)
+    requires_approval = _flag_property(FLAG_REQUIRES_APPROVAL)
     
     # Relationships
     employee = relationship("Employee", back_populates="attendances")
@@ -78,25 +106,40 @@ class Attendance(Base):
     # Indexes for performance
     __table_args__ = (
         Index('idx_att_emp_date', 'employee_id', 'date', unique=True),
-        Index('idx_att_company_date', 'company_id', 'date'),
+        # Covering index: month summaries are answered by index-only scans
+        Index(
+            'idx_att_company_date', 'company_id', 'date',
+            postgresql_include=['employee_id', 'status', 'total_hours']
+        ),
         Index('idx_att_status_date', 'status', 'date'),
-        Index('idx_att_approval', 'requires_approval', 'approved_by'),
+        # Only the (few) rows awaiting approval are indexed
+        Index(
+            'idx_att_pending_approval', 'company_id', 'approved_by',
+            postgresql_where=text(f"(flags & {FLAG_REQUIRES_APPROVAL}) <> 0")
+        ),
     )
 
 
 class AttendancePunch(Base):
-    """Detailed punch records for audit trail"""
+    """
+    Detailed punch records for audit trail
+
+    Range-partitioned by month on punch_time, so "this month" queries only
+    touch one partition. Postgres requires the partition key in the primary
+    key, hence (id, punch_time). Monthly partitions are created ahead of time
+    by punch_partitions_ddl().
+    """
     __tablename__ = "attendance_punches"
     
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     attendance_id = Column(Integer, ForeignKey("attendances.id"), nullable=False)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
     punch_type = Column(Enum(PunchType), nullable=False)
-    punch_time = Column(DateTime(timezone=True), nullable=False)
+    punch_time = Column(DateTime(timezone=True), primary_key=True)
     
     # Location data
-    latitude = Column(Numeric(10, 8))
-    longitude = Column(Numeric(11, 8))
+    latitude = Column(Float(precision=53))
+    longitude = Column(Float(precision=53))
     address = Column(String(500))
     device_info = Column(String(255))  # Device/browser info
     ip_address = Column(String(45))
@@ -106,7 +149,7 @@ class AttendancePunch(Base):
     distance_from_office = Column(Integer)  # meters
     
     # System fields
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.statement_timestamp())
     
     # Relationships
     attendance = relationship("Attendance")
@@ -114,11 +157,112 @@ class AttendancePunch(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_punch_emp_time', 'employee_id', 'punch_time'),
+        Index('idx_punch_emp_time', 'employee_id', 'punch_time', postgresql_include=['punch_type']),
         Index('idx_punch_type_date', 'punch_type', 'punch_time'),
+        {'postgresql_partition_by': 'RANGE (punch_time)'},
     )
 
 
+# Monthly punch partitions kept ready beyond the current month
+PUNCH_PARTITION_MONTHS_AHEAD = 2
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def punch_partitions_ddl(start: date, months_ahead: int) -> str:
+    """
+    Create the monthly attendance_punches partitions from ``start``'s month
+    through ``months_ahead`` months later, plus a DEFAULT catch-all.
+
+    A no-op on databases whose attendance_punches predates partitioning.
+    """
+    month = start.replace(day=1)
+    statements = ["CREATE TABLE IF NOT EXISTS attendance_punches_default PARTITION OF attendance_punches DEFAULT"]
+    for offset in range(months_ahead + 1):
+        lower, upper = _add_months(month, offset), _add_months(month, offset + 1)
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS attendance_punches_{lower:%Ym%m} PARTITION OF attendance_punches "
+            f"FOR VALUES FROM ('{lower.isoformat()} 00:00+00') TO ('{upper.isoformat()} 00:00+00')"
+        )
+    return (
+        "DO $$ BEGIN "
+        "IF EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = 'attendance_punches'::regclass) THEN "
+        + "; ".join(statements) +
+        "; END IF; END $$"
+    )
+
+
+def _coordinates_to_float8(table_name: str, columns: list) -> str:
+    """Convert NUMERIC coordinate columns to double precision, once, on existing databases"""
+    alters = ", ".join(
+        f"ALTER COLUMN {name} TYPE double precision USING {name}::double precision"
+        for name in columns
+    )
+    return (
+        "DO $$ BEGIN "
+        "IF EXISTS (SELECT 1 FROM information_schema.columns "
+        f"WHERE table_name = '{table_name}' AND column_name = '{columns[0]}' AND data_type = 'numeric') THEN "
+        f"ALTER TABLE {table_name} {alters}; "
+        "END IF; END $$"
+    )
+
+
+def _pack_attendance_flags() -> str:
+    """Fold the old boolean columns into Attendance.flags and drop them, once"""
+    return (
+        "DO $$ BEGIN "
+        "IF EXISTS (SELECT 1 FROM information_schema.columns "
+        "WHERE table_name = 'attendances' AND column_name = 'is_late') THEN "
+        "ALTER TABLE attendances ADD COLUMN IF NOT EXISTS flags smallint NOT NULL DEFAULT 0; "
+        "UPDATE attendances SET flags = "
+        f"(CASE WHEN is_late THEN {FLAG_LATE} ELSE 0 END) "
+        f"| (CASE WHEN early_departure THEN {FLAG_EARLY_DEPARTURE} ELSE 0 END) "
+        f"| (CASE WHEN requires_approval THEN {FLAG_REQUIRES_APPROVAL} ELSE 0 END); "
+        "ALTER TABLE attendances DROP COLUMN is_late, DROP COLUMN early_departure, "
+        "DROP COLUMN requires_approval; "
+        "END IF; END $$"
+    )
+
+
+def _index(model, name: str) -> Index:
+    return next(index for index in model.__table__.indexes if index.name == name)
+
+
+def _create_index(index: Index) -> str:
+    return str(CreateIndex(index, if_not_exists=True).compile(dialect=postgresql.dialect()))
+
+
+def _drop_if_not_covering(name: str) -> str:
+    """Drop an index created before it had INCLUDE columns so it can be recreated"""
+    return (
+        "DO $$ BEGIN "
+        "IF EXISTS (SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+        f"WHERE c.relname = '{name}' AND i.indnatts = i.indnkeyatts) THEN "
+        f"DROP INDEX {name}; "
+        "END IF; END $$"
+    )
+
+
+def attendance_upgrade_ddl() -> list:
+    """DDL bringing attendance tables created by older versions in line with the models"""
+    return [
+        _pack_attendance_flags(),
+        _create_index(_index(Attendance, "idx_att_pending_approval")),
+        _drop_if_not_covering("idx_att_company_date"),
+        _create_index(_index(Attendance, "idx_att_company_date")),
+        _drop_if_not_covering("idx_punch_emp_time"),
+        _create_index(_index(AttendancePunch, "idx_punch_emp_time")),
+        _coordinates_to_float8("attendances", [
+            "punch_in_latitude", "punch_in_longitude",
+            "punch_out_latitude", "punch_out_longitude",
+        ]),
+        _coordinates_to_float8("attendance_punches", ["latitude", "longitude"]),
+    ]
+
+
 class Shift(Base):
     __tablename__ = "shifts"
     
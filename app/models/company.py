@@ -100,7 +100,7 @@ class Company(Base):
     # Indexes
     __table_args__ = (
         Index('idx_company_status_subscription', 'status', 'subscription_end'),
-        Index('idx_company_created_at', 'created_at'),
+        Index('idx_company_created_at', 'created_at', 'id'),
     )
 
 
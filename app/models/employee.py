@@ -1,4 +1,6 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Enum, Index, Date
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
 from sqlalchemy.types import Numeric
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -6,6 +8,11 @@ from app.core.database import Base
 import enum
 
 
+def search_text(first_name, last_name, work_email, employee_id):
+    """Text matched by employee search; idx_emp_search_trgm indexes exactly this expression"""
+    return first_name + " " + last_name + " " + func.coalesce(work_email, "") + " " + employee_id
+
+
 class EmployeeStatus(str, enum.Enum):
     ACTIVE = "active"
     INACTIVE = "inactive"
@@ -150,6 +157,14 @@ class Employee(Base):
         Index('idx_emp_department', 'department_id', 'status'),
         Index('idx_emp_manager', 'manager_id'),
         Index('idx_emp_hire_date', 'hire_date'),
+        Index('idx_emp_company_created', 'company_id', 'created_at', 'id'),
+        # Trigram GIN index so '%term%' searches avoid a sequential scan (needs pg_trgm)
+        Index(
+            'idx_emp_search_trgm',
+            search_text(first_name, last_name, work_email, employee_id).label('search_text'),
+            postgresql_using='gin',
+            postgresql_ops={'search_text': 'gin_trgm_ops'}
+        ),
     )
 
 
@@ -177,3 +192,11 @@ class EmployeeDocument(Base):
         Index('idx_emp_doc_type', 'employee_id', 'document_type'),
         Index('idx_emp_doc_expiry', 'expiry_date'),
     )
+
+
+def employee_upgrade_ddl() -> list:
+    """DDL adding indexes that create_all skips on an existing employees table"""
+    search_index = next(
+        index for index in Employee.__table__.indexes if index.name == "idx_emp_search_trgm"
+    )
+    return [str(CreateIndex(search_index, if_not_exists=True).compile(dialect=postgresql.dialect()))]
@@ -75,7 +75,7 @@ class Expense(Base):
     
     # Indexes
     __table_args__ = (
-        Index('idx_expense_emp_date', 'employee_id', 'expense_date'),
+        Index('idx_expense_emp_date', 'employee_id', 'expense_date', 'id'),
         Index('idx_expense_status', 'status', 'submitted_at'),
         Index('idx_expense_company', 'company_id', 'status'),
     )
@@ -1,7 +1,8 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Enum, Index, Date, Text
 from sqlalchemy.types import Numeric
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, select, and_, table, column
+from sqlalchemy.dialects import postgresql
 from app.core.database import Base
 import enum
 
@@ -96,16 +97,85 @@ class Performance(Base):
     reviewer = relationship("Employee", foreign_keys=[reviewer_id])
     final_reviewer = relationship("User", foreign_keys=[final_reviewer_id])
     creator = relationship("User", foreign_keys=[created_by])
-    goals = relationship("PerformanceGoal", back_populates="performance")
+    goals = relationship("PerformanceGoal", back_populates="performance", lazy="selectin")
     
     # Indexes
     __table_args__ = (
         Index('idx_perf_emp_period', 'employee_id', 'review_period_start', 'review_period_end'),
         Index('idx_perf_status_due', 'status', 'due_date'),
         Index('idx_perf_company', 'company_id', 'status'),
+        Index('idx_perf_company_employee', 'company_id', 'employee_id', 'review_period_start', 'id'),
+        Index('idx_perf_company_reviewer', 'company_id', 'reviewer_id', 'due_date', 'id'),
+        Index('idx_perf_company_period', 'company_id', 'review_period_start'),
+        Index('idx_perf_company_created', 'company_id', 'created_at', 'id'),
+        # Covering index so period analytics are an index-only scan
+        Index(
+            'idx_perf_analytics',
+            'company_id', 'review_period_start', 'review_period_end',
+            postgresql_include=['overall_rating', 'status']
+        ),
     )
 
 
+# Per-cycle review aggregates. Reviews are created in cohorts sharing the same
+# period, so grouping by exact period dates keeps the view small while still
+# answering start/end date filters exactly. Refreshed by
+# app.tasks.performance.refresh_performance_analytics.
+PERFORMANCE_ANALYTICS_VIEW = "mv_performance_analytics"
+
+
+def _performance_analytics_query():
+    rating = Performance.overall_rating
+    return select(
+        Performance.company_id,
+        Performance.review_period_start,
+        Performance.review_period_end,
+        func.count().label("total"),
+        func.count(rating).label("rated"),
+        func.coalesce(func.sum(rating), 0).label("rating_sum"),
+        func.count().filter(rating >= 4.5).label("excellent"),
+        func.count().filter(and_(rating >= 3.5, rating < 4.5)).label("good"),
+        func.count().filter(and_(rating >= 2.5, rating < 3.5)).label("average"),
+        func.count().filter(rating < 2.5).label("below_average"),
+        *[
+            func.count().filter(Performance.status == status).label(status.name.lower())
+            for status in ReviewStatus
+        ]
+    ).group_by(
+        Performance.company_id,
+        Performance.review_period_start,
+        Performance.review_period_end
+    )
+
+
+def performance_analytics_ddl() -> list:
+    """DDL for the analytics view and the unique index REFRESH ... CONCURRENTLY needs"""
+    query = _performance_analytics_query().compile(
+        dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+    )
+    return [
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS {PERFORMANCE_ANALYTICS_VIEW} AS {query}",
+        f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{PERFORMANCE_ANALYTICS_VIEW} ON {PERFORMANCE_ANALYTICS_VIEW} "
+        f"(company_id, review_period_start, review_period_end)",
+    ]
+
+
+performance_analytics_view = table(
+    PERFORMANCE_ANALYTICS_VIEW,
+    column("company_id"),
+    column("review_period_start"),
+    column("review_period_end"),
+    column("total"),
+    column("rated"),
+    column("rating_sum"),
+    column("excellent"),
+    column("good"),
+    column("average"),
+    column("below_average"),
+    *[column(status.name.lower()) for status in ReviewStatus]
+)
+
+
 class PerformanceGoal(Base):
     __tablename__ = "performance_goals"
     
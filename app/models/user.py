@@ -62,3 +62,24 @@ class User(Base):
         Index('idx_user_role_status', 'role', 'status'),
         Index('idx_user_created_at', 'created_at'),
     )
+
+
+def user_upgrade_ddl() -> list:
+    """
+    Lowercase stored emails written before addresses were normalised on write.
+
+    Rows whose lowercased email would collide with another user's are left
+    as they are; init_db reports them (see case_duplicate_emails_sql).
+    """
+    return [
+        "DROP INDEX IF EXISTS ix_user_email_lower",
+        "UPDATE users SET email = lower(email) WHERE email <> lower(email) "
+        "AND NOT EXISTS (SELECT 1 FROM users other "
+        "WHERE lower(other.email) = lower(users.email) AND other.id <> users.id)",
+    ]
+
+
+# Emails that still differ only by case and need a manual merge
+case_duplicate_emails_sql = (
+    "SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1"
+)
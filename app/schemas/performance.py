@@ -456,6 +456,18 @@ class SuccessionPlan(SuccessionPlanBase):
         from_attributes = True
 
 
+class ReminderType(str, Enum):
+    DUE_SOON = "due_soon"
+    OVERDUE = "overdue"
+    SELF_ASSESSMENT = "self_assessment"
+    MANAGER_REVIEW = "manager_review"
+
+
+class ReviewReminderRequest(BaseModel):
+    type: ReminderType
+    recipients: List[int] = Field(..., min_length=1, max_length=1000)  # employee IDs
+
+
 class PerformanceReminderBase(BaseModel):
     reminder_type: str = Field(..., pattern="^(due_soon|overdue|self_assessment|manager_review)$")
     scheduled_date: datetime
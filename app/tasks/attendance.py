@@ -0,0 +1,34 @@
+"""
+Attendance maintenance tasks
+"""
+
+from datetime import date
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.models.attendance import PUNCH_PARTITION_MONTHS_AHEAD, punch_partitions_ddl
+
+logger = logging.getLogger(__name__)
+
+
+async def _create_partitions() -> None:
+    # Each task run gets its own event loop, so use an unpooled engine
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(punch_partitions_ddl(date.today(), PUNCH_PARTITION_MONTHS_AHEAD)))
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="app.tasks.attendance.ensure_punch_partitions")
+def ensure_punch_partitions() -> None:
+    """Keep monthly attendance_punches partitions created ahead of the calendar"""
+    asyncio.run(_create_partitions())
+    logger.info("Ensured attendance_punches partitions")
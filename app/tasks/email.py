@@ -0,0 +1,20 @@
+"""
+Email delivery tasks
+"""
+
+from typing import List
+import asyncio
+import logging
+
+from app.celery_app import celery_app
+from app.core.email import send_bulk_email
+
+logger = logging.getLogger(__name__)
+
+
+@celery_app.task(name="app.tasks.email.send_bulk_email")
+def send_bulk_email_task(recipients: List[str], subject: str, body: str) -> int:
+    """Send one message to many recipients off the request path"""
+    sent = asyncio.run(send_bulk_email(recipients, subject=subject, body=body))
+    logger.info(f"Bulk email '{subject}' accepted for {sent}/{len(recipients)} recipients")
+    return sent
@@ -0,0 +1,33 @@
+"""
+Performance analytics maintenance tasks
+"""
+
+import asyncio
+import logging
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.celery_app import celery_app
+from app.core.config import settings
+from app.models.performance import PERFORMANCE_ANALYTICS_VIEW
+
+logger = logging.getLogger(__name__)
+
+
+async def _refresh_view() -> None:
+    # Each task run gets its own event loop, so use an unpooled engine
+    engine = create_async_engine(settings.DATABASE_URL, poolclass=NullPool)
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {PERFORMANCE_ANALYTICS_VIEW}"))
+    finally:
+        await engine.dispose()
+
+
+@celery_app.task(name="app.tasks.performance.refresh_performance_analytics")
+def refresh_performance_analytics() -> None:
+    """Recompute the per-cycle performance aggregates without blocking readers"""
+    asyncio.run(_refresh_view())
+    logger.info(f"Refreshed {PERFORMANCE_ANALYTICS_VIEW}")
@@ -0,0 +1,108 @@
+"""
+Report generation tasks
+
+Rendering libraries (reportlab, openpyxl) and the S3 client are imported
+inside the tasks so API workers never pay for them.
+"""
+
+from typing import Any, Dict
+import io
+import logging
+
+from app.celery_app import celery_app
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+EXPORT_URL_EXPIRES_SECONDS = 3600
+
+EXPORT_FORMATS = {
+    "pdf": ("pdf", "application/pdf"),
+    "excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+
+def _render_review_pdf(review: Dict[str, Any]) -> bytes:
+    """Render a performance review as a simple key/value PDF"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4)
+    _, height = A4
+    y = height - 50
+
+    pdf.setFont("Helvetica-Bold", 14)
+    pdf.drawString(50, y, f"Performance Review #{review['id']}")
+    pdf.setFont("Helvetica", 10)
+
+    for field, value in review.items():
+        if field == "goals" or value is None:
+            continue
+        y -= 16
+        if y < 50:
+            pdf.showPage()
+            pdf.setFont("Helvetica", 10)
+            y = height - 50
+        pdf.drawString(50, y, f"{field.replace('_', ' ').title()}: {value}"[:120])
+
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _render_review_excel(review: Dict[str, Any]) -> bytes:
+    """Render a performance review as a workbook with a goals sheet"""
+    from openpyxl import Workbook
+
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Review"
+    for field, value in review.items():
+        if field != "goals":
+            sheet.append([field, value])
+
+    goals = review.get("goals") or []
+    if goals:
+        goals_sheet = workbook.create_sheet("Goals")
+        columns = list(goals[0].keys())
+        goals_sheet.append(columns)
+        for goal in goals:
+            goals_sheet.append([goal.get(column) for column in columns])
+
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+@celery_app.task(bind=True, name="app.tasks.reports.export_performance_review")
+def export_performance_review(self, review: Dict[str, Any], format: str, company_id: int) -> Dict[str, Any]:
+    """Render a performance review export, store it in S3 and return a signed URL"""
+    import boto3
+
+    extension, content_type = EXPORT_FORMATS[format]
+    if format == "pdf":
+        content = _render_review_pdf(review)
+    else:
+        content = _render_review_excel(review)
+
+    key = f"exports/{company_id}/performance-review-{review['id']}-{self.request.id}.{extension}"
+    s3 = boto3.client(
+        "s3",
+        region_name=settings.AWS_REGION,
+        aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+    )
+    s3.put_object(Bucket=settings.AWS_BUCKET_NAME, Key=key, Body=content, ContentType=content_type)
+    url = s3.generate_presigned_url(
+        "get_object",
+        Params={"Bucket": settings.AWS_BUCKET_NAME, "Key": key},
+        ExpiresIn=EXPORT_URL_EXPIRES_SECONDS,
+    )
+
+    logger.info(f"Exported performance review {review['id']} as {format}")
+    return {
+        "review_id": review["id"],
+        "company_id": company_id,
+        "format": format,
+        "url": url,
+    }
@@ -1,7 +1,7 @@
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.gzip import GZipMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
@@ -9,14 +9,16 @@ import time
 import logging
 import uvicorn
 import structlog
+from sqlalchemy import text
 
 from app.core.config import settings
 from app.core.database import init_db
 from app.core.redis import redis_manager
+from app.core.security import revocation_listener
 from app.api.v1.api import api_router
 from app.middleware.auth import AuthMiddleware
-from app.middleware.tenant import TenantMiddleware
 from app.middleware.logging import LoggingMiddleware
+from app.middleware.request_cache import RequestCacheMiddleware
 
 # Configure structured logging
 structlog.configure(
@@ -44,6 +46,7 @@ limiter = Limiter(key_func=get_remote_address)
 
 # Create FastAPI app
 app = FastAPI(
+    default_response_class=ORJSONResponse,
     title="HRMS SaaS API",
     description="Comprehensive Human Resource Management System API",
     version="1.0.0",
@@ -57,6 +60,11 @@ app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
 
 # Middleware configuration
+# Starlette runs the last middleware added outermost, so requests pass through
+# GZip (optional) -> CORS -> Logging -> Auth (+ tenant) -> RequestCache -> route
+app.add_middleware(RequestCacheMiddleware)
+app.add_middleware(AuthMiddleware)
+app.add_middleware(LoggingMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_ORIGINS,
@@ -65,10 +73,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-app.add_middleware(GZipMiddleware, minimum_size=1000)
-app.add_middleware(LoggingMiddleware)
-app.add_middleware(TenantMiddleware)
-app.add_middleware(AuthMiddleware)
+# Compression is done by the reverse proxy (see nginx.conf); opt in only when serving directly
+if settings.ENABLE_GZIP:
+    app.add_middleware(GZipMiddleware, minimum_size=2000)
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -99,13 +106,12 @@ async def readiness_check():
     try:
         # Check database connectivity
         from app.core.database import engine
-        async with engine.begin() as conn:
-            await conn.execute("SELECT 1")
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
         
         # Check Redis connectivity
         redis_client = await redis_manager.get_redis()
         await redis_client.ping()
-        await redis_client.close()
         
         return {"status": "ready", "timestamp": time.time()}
     except Exception as e:
@@ -124,6 +130,9 @@ async def startup_event():
     # Initialize Redis
     await redis_manager.init_redis()
     
+    # Receive token revocations made on other workers
+    await revocation_listener.start()
+    
     # Initialize database
     await init_db()
     
@@ -134,9 +143,10 @@ async def shutdown_event():
     """Shutdown event handler"""
     logger.info("Shutting down HRMS API server")
     
+    await revocation_listener.stop()
+    
     # Close Redis connections
-    if redis_manager.redis_pool:
-        redis_manager.redis_pool.disconnect()
+    await redis_manager.close()
     
     logger.info("HRMS API server shut down successfully")
 
@@ -0,0 +1,79 @@
+import pytest
+
+from app.crud.performance import performance_goal_crud
+
+
+class _Goal:
+    def __init__(self, id):
+        self.id = id
+
+
+class _Result:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def scalars(self):
+        return self
+
+    def all(self):
+        return self.rows
+
+
+class _RecordingSession:
+    """Stands in for AsyncSession and keeps the statements it was asked to run"""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return _Result(self.rows)
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(compile_kwargs={"literal_binds": True}))
+
+
+@pytest.mark.asyncio
+async def test_goals_skip_is_applied_as_offset_without_cursor():
+    db = _RecordingSession()
+    await performance_goal_crud.get_goals_by_performance(db, performance_id=1, skip=20, limit=10)
+
+    sql = _sql(db.statements[0])
+    assert "OFFSET 20" in sql
+    assert "LIMIT 11" in sql
+
+
+@pytest.mark.asyncio
+async def test_goals_cursor_takes_precedence_over_skip():
+    db = _RecordingSession()
+    await performance_goal_crud.get_goals_by_performance(
+        db, performance_id=1, after_id=5, skip=20, limit=10
+    )
+
+    sql = _sql(db.statements[0])
+    assert "OFFSET" not in sql
+    assert "performance_goals.id > 5" in sql
+
+
+@pytest.mark.asyncio
+async def test_goals_exactly_full_last_page_has_no_cursor():
+    db = _RecordingSession(rows=[_Goal(id) for id in range(1, 11)])
+    goals, next_cursor = await performance_goal_crud.get_goals_by_performance(
+        db, performance_id=1, limit=10
+    )
+
+    assert len(goals) == 10
+    assert next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_goals_look_ahead_row_is_trimmed_into_cursor():
+    db = _RecordingSession(rows=[_Goal(id) for id in range(1, 12)])
+    goals, next_cursor = await performance_goal_crud.get_goals_by_performance(
+        db, performance_id=1, limit=10
+    )
+
+    assert [goal.id for goal in goals] == list(range(1, 11))
+    assert next_cursor == "10"